@@ -0,0 +1,33 @@
+"""Benchmark for the time of ``import zExceptions`` in a fresh interpreter.
+
+Run with ``python benchmarks/bench_import.py``.  The import times are taken
+from ``python -X importtime``.
+"""
+import subprocess
+import sys
+
+
+def importTime(module):
+    """Return the cumulative import time of `module` in microseconds and the
+    number of modules imported."""
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        stderr=subprocess.PIPE, check=True, text=True).stderr
+    lines = [line for line in output.splitlines()
+             if line.startswith('import time:') and '|' in line]
+    for line in lines:
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if name.strip() == module:
+            return int(cumulative_us), len(lines) - 1
+    raise ValueError(f'{module} not found in the import times')
+
+
+def main(module='zExceptions', repeat=10):
+    timings = [importTime(module) for i in range(repeat)]
+    best = min(cumulative for cumulative, count in timings)
+    count = timings[0][1]
+    print(f'import {module}: {best / 1000:.1f} ms, {count} modules')
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
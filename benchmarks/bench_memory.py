@@ -0,0 +1,52 @@
+"""Memory benchmark for creating many exception instances.
+
+Run with ``python benchmarks/bench_memory.py``.
+"""
+import tracemalloc
+
+from zExceptions import NotFound
+from zExceptions import Unauthorized
+
+
+def not_found():
+    return NotFound('/missing')
+
+
+def not_found_with_header():
+    exc = NotFound('/missing')
+    exc.setHeader('Cache-Control', 'no-store')
+    return exc
+
+
+def unauthorized_name():
+    return Unauthorized('manage_main')
+
+
+def unauthorized_realm():
+    return Unauthorized('You are not allowed', realm='Zope')
+
+
+CASES = [not_found, not_found_with_header, unauthorized_name,
+         unauthorized_realm]
+
+
+def measure(factory, number):
+    tracemalloc.start()
+    try:
+        instances = [factory() for i in range(number)]
+        size, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del instances
+    return size
+
+
+def main(number=1000000):
+    for factory in CASES:
+        size = measure(factory, number)
+        print(f'{factory.__name__}: {size / number:.0f} bytes/instance '
+              f'({size / 2**20:.0f} MiB for {number} instances)')
+
+
+if __name__ == '__main__':
+    main()
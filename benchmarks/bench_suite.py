@@ -0,0 +1,168 @@
+"""Benchmarks of the hot paths of zExceptions.
+
+Run with ``python benchmarks/bench_suite.py --help`` for the options.
+"""
+import sys
+
+from harness import run
+
+from zExceptions import NotFound
+from zExceptions import Unauthorized
+from zExceptions import convertExceptionType
+from zExceptions import upgradeException
+from zExceptions.controlflow import ControlFlowUnauthorized
+from zExceptions.ExceptionFormatter import format_exception
+
+
+ENVIRON = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/missing'}
+
+
+def start_response(status, headers):
+    pass
+
+
+def wsgi_not_found():
+    def call():
+        NotFound()(ENVIRON, start_response)
+    return call
+
+
+def asgi_not_found():
+    scope = {'type': 'http', 'method': 'GET', 'path': '/missing',
+             'headers': [(b'host', b'localhost')]}
+
+    async def receive():
+        pass
+
+    async def send(message):
+        pass
+
+    def call():
+        # Nothing is awaited for real, so no event loop is needed.
+        try:
+            NotFound().asgi(scope, receive, send).send(None)
+        except StopIteration:
+            pass
+    return call
+
+
+def unauthorized_name():
+    def call():
+        Unauthorized('manage_main')
+    return call
+
+
+def unauthorized_message():
+    def call():
+        Unauthorized('You are not allowed to access this', realm='Zope')
+    return call
+
+
+def unauthorized_str():
+    exc = Unauthorized('manage_main')
+
+    def call():
+        str(exc)
+    return call
+
+
+def convert_exception_type():
+    def call():
+        convertExceptionType('NotFound')
+        convertExceptionType('NoSuchException')
+    return call
+
+
+def upgrade_exception():
+    class Redirect(Exception):
+        pass
+
+    def call():
+        upgradeException(Redirect, 'http://example.com')
+    return call
+
+
+def raise_catch(make):
+    def traverse():
+        raise make()
+
+    def setup():
+        def call():
+            try:
+                traverse()
+            except NotFound:
+                pass
+            except Unauthorized:
+                pass
+        return call
+    return setup
+
+
+class Supplement:
+
+    source_url = '/folder/script'
+    line = 12
+    column = 4
+
+    def __init__(self, expression):
+        self.expression = expression
+
+
+def _makeFunctions(depth, supplement):
+    # Distinct functions, so no frames are collapsed as repetitions.
+    source = []
+    for i in range(depth):
+        source.append(f'def f{i}():')
+        source.append(f'    __traceback_info__ = "level {i}"')
+        if supplement:
+            source.append(
+                f'    __traceback_supplement__ = (Supplement, "f{i}")')
+        if i + 1 < depth:
+            source.append(f'    f{i + 1}()')
+        else:
+            source.append('    raise ValueError("innermost")')
+    namespace = {'Supplement': Supplement}
+    exec(compile('\n'.join(source), f'<depth {depth}>', 'exec'), namespace)
+    return namespace['f0']
+
+
+def format_exception_case(depth, as_html, supplement):
+    def setup():
+        func = _makeFunctions(depth, supplement)
+        try:
+            func()
+        except ValueError:
+            t, v, tb = sys.exc_info()
+
+        def call():
+            format_exception(t, v, tb, as_html=as_html)
+        return call
+    return setup
+
+
+BENCHMARKS = [
+    ('wsgi_not_found', wsgi_not_found),
+    ('asgi_not_found', asgi_not_found),
+    ('unauthorized_name', unauthorized_name),
+    ('unauthorized_message', unauthorized_message),
+    ('unauthorized_str', unauthorized_str),
+    ('convert_exception_type', convert_exception_type),
+    ('upgrade_exception', upgrade_exception),
+    ('raise_not_found', raise_catch(lambda: NotFound('default'))),
+    ('raise_unauthorized', raise_catch(lambda: Unauthorized('manage_main'))),
+    ('raise_unauthorized_control_flow',
+     raise_catch(ControlFlowUnauthorized.instance)),
+]
+
+for depth in (10, 100, 200):
+    for as_html in (0, 1):
+        for supplement in (False, True):
+            name = 'format_exception_{}_{}{}'.format(
+                'html' if as_html else 'text', depth,
+                '_supplement' if supplement else '')
+            BENCHMARKS.append(
+                (name, format_exception_case(depth, as_html, supplement)))
+
+
+if __name__ == '__main__':
+    run(BENCHMARKS)
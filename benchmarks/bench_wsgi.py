@@ -0,0 +1,27 @@
+"""Micro-benchmark for rendering ``NotFound`` as a WSGI application.
+
+Run with ``python benchmarks/bench_wsgi.py``.
+"""
+import timeit
+
+from zExceptions import NotFound
+
+
+ENVIRON = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/missing'}
+
+
+def start_response(status, headers):
+    pass
+
+
+def main(number=200000, repeat=5):
+    def call():
+        NotFound()(ENVIRON, start_response)
+
+    timings = timeit.repeat(call, number=number, repeat=repeat)
+    best = min(timings) / number * 1e9
+    print(f'NotFound()(environ, start_response): {best:.0f} ns/call')
+
+
+if __name__ == '__main__':
+    main()
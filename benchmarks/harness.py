@@ -0,0 +1,92 @@
+"""A small timeit based harness for the benchmarks in this directory.
+
+Results can be written to a JSON file and compared with the results of an
+earlier run::
+
+  python benchmarks/bench_suite.py --output before.json
+  python benchmarks/bench_suite.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+
+
+def timeCall(func, repeat=5, min_time=0.2):
+    """Return the best and the mean time of one call of `func` in seconds.
+
+    The number of calls per measurement is chosen so that a measurement
+    takes at least `min_time` seconds.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+        number *= 10
+    timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {'best': min(timings), 'mean': sum(timings) / len(timings),
+            'number': number, 'repeat': repeat}
+
+
+def formatTime(seconds):
+    if seconds < 1e-6:
+        return f'{seconds * 1e9:.0f} ns'
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:.1f} us'
+    return f'{seconds * 1e3:.2f} ms'
+
+
+def compare(results, previous):
+    """Yield (name, previous best, best, relative change) tuples."""
+    for name, result in results.items():
+        old = previous.get(name)
+        if old is None:
+            continue
+        yield name, old['best'], result['best'], result['best'] / old['best']
+
+
+def run(benchmarks, argv=None):
+    """Run `benchmarks`, a list of (name, setup) pairs.
+
+    `setup` is called once and returns the function to time.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-o', '--output', help='write the results as JSON')
+    parser.add_argument('-c', '--compare',
+                        help='compare with the results in this JSON file')
+    parser.add_argument('-k', '--filter', default='',
+                        help='only run benchmarks containing this string')
+    parser.add_argument('--fast', action='store_true',
+                        help='fewer and shorter measurements')
+    options = parser.parse_args(argv)
+    repeat, min_time = (3, 0.05) if options.fast else (5, 0.2)
+
+    results = {}
+    for name, setup in benchmarks:
+        if options.filter not in name:
+            continue
+        result = timeCall(setup(), repeat=repeat, min_time=min_time)
+        results[name] = result
+        print(f'{name}: {formatTime(result["best"])}', flush=True)
+
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump({'python': platform.python_version(),
+                       'implementation': platform.python_implementation(),
+                       'benchmarks': results}, f, indent=2, sort_keys=True)
+
+    if options.compare:
+        with open(options.compare) as f:
+            previous = json.load(f)['benchmarks']
+        print()
+        width = max(len(name) for name in results) if results else 0
+        for name, old, new, ratio in compare(results, previous):
+            print(f'{name:{width}}  {formatTime(old):>9} -> '
+                  f'{formatTime(new):>9}  {(ratio - 1) * 100:+.1f}%')
+    return results
+
+
+if __name__ == '__main__':
+    sys.exit('Run one of the bench_*.py scripts instead.')
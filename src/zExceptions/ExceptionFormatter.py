@@ -15,20 +15,79 @@
 optionally in HTML.
 """
 
+import json
 import sys
+import threading
+import time
+import zlib
 from html import escape as html_escape
 
+from zExceptions.cache import LRUCache
+from zExceptions.instrumentation import notifyFormatted
+from zExceptions.instrumentation import observers
+
 
 DEBUG_EXCEPTION_FORMATTER = 1
 
+# The static first line of formatted frames, keyed on
+# (formatter class, show_revisions, code, lineno, module name).
+line_cache = LRUCache(1024)
+
+
+class _BudgetedSupplement:
+    """Proxy of a traceback supplement calling getInfo() within a deadline.
+
+    Extra info computed after the deadline is dropped, and getInfo() is not
+    called at all once the deadline has passed.
+    """
+
+    __slots__ = ('_supplement', '_deadline', '_exceeded')
+
+    def __init__(self, supplement, deadline):
+        self._supplement = supplement
+        self._deadline = deadline
+        self._exceeded = False
+
+    def __getattr__(self, name):
+        value = getattr(self._supplement, name)
+        if name != 'getInfo':
+            return value
+
+        def getInfo(*args):
+            if time.perf_counter() > self._deadline:
+                self._exceeded = True
+                return None
+            info = value(*args)
+            if time.perf_counter() > self._deadline:
+                self._exceeded = True
+                return None
+            return info
+        return getInfo
+
 
 class TextExceptionFormatter:
 
     line_sep = '\n'
     show_revisions = 0
-
-    def __init__(self, limit=None):
+    # Collapse frames repeated at least min_repeats times in a row, in
+    # cycles of up to max_period frames.
+    elide_repeats = True
+    min_repeats = 20
+    max_period = 8
+
+    def __init__(self, limit=None, tail=None, frame_budget=None,
+                 traceback_budget=None, timings=None):
+        # Time budgets in seconds for evaluating the traceback supplement
+        # of one frame and all supplements of one traceback.  A supplement
+        # factory cannot be interrupted: if it runs over the budget, its
+        # supplement is not formatted, and once the traceback budget is
+        # spent, the remaining supplements are not evaluated at all.
         self.limit = limit
+        self.tail = tail
+        self.frame_budget = frame_budget
+        self.traceback_budget = traceback_budget
+        # A SupplementTimings recording the time spent per factory.
+        self.timings = timings
 
     def escape(self, s):
         return s
@@ -116,48 +175,50 @@ class TextExceptionFormatter:
     def formatTracebackInfo(self, tbi):
         return self.formatSupplementLine(f'__traceback_info__: {tbi}')
 
-    def formatLine(self, tb):
-        f = tb.tb_frame
-        lineno = tb.tb_lineno
-        co = f.f_code
-        filename = co.co_filename
-        name = co.co_name
-        locals = f.f_locals
-        globals = f.f_globals
-        modname = globals.get('__name__', filename)
-
+    def formatLineHead(self, co, lineno, modname, globals):
         s = '  Module %s, line %d' % (modname, lineno)
 
         revision = self.getRevision(globals)
         if revision:
             s = s + ', rev. %s' % revision
 
-        s = s + ', in %s' % name
-
-        result = []
-        result.append(self.escape(s))
+        s = s + ', in %s' % co.co_name
+        return self.escape(s)
 
-        # Output a traceback supplement, if any.
+    def getSupplement(self, locals, globals):
         if '__traceback_supplement__' in locals:
             # Use the supplement defined in the function.
-            tbs = locals['__traceback_supplement__']
-        elif '__traceback_supplement__' in globals:
-            # Use the supplement defined in the module.
-            # This is used by Scripts (Python).
-            tbs = globals['__traceback_supplement__']
-        else:
-            tbs = None
+            return locals['__traceback_supplement__']
+        # Use the supplement defined in the module.
+        # This is used by Scripts (Python).
+        return globals.get('__traceback_supplement__', None)
+
+    def formatSupplementSkipped(self):
+        return self.formatSupplementLine(
+            'Supplement skipped, time budget exceeded')
+
+    def formatLine(self, tb, deadline=None):
+        f = tb.tb_frame
+        lineno = tb.tb_lineno
+        co = f.f_code
+        locals = f.f_locals
+        globals = f.f_globals
+        modname = globals.get('__name__', co.co_filename)
+
+        # Only the supplement and the traceback info differ between
+        # occurrences of the same line.
+        key = (self.__class__, self.show_revisions, co, lineno, modname)
+        head = line_cache.get(key)
+        if head is None:
+            head = self.formatLineHead(co, lineno, modname, globals)
+            line_cache.set(key, head)
+
+        result = [head]
+
+        # Output a traceback supplement, if any.
+        tbs = self.getSupplement(locals, globals)
         if tbs is not None:
-            factory = tbs[0]
-            args = tbs[1:]
-            try:
-                supp = factory(*args)
-                result.extend(self.formatSupplement(supp, tb))
-            except:  # noqa: E722 do not use bare 'except'
-                if DEBUG_EXCEPTION_FORMATTER:
-                    import traceback
-                    traceback.print_exc()
-                # else just swallow the exception.
+            result.extend(self.evaluateSupplement(tbs, tb, deadline))
 
         try:
             tbi = locals.get('__traceback_info__', None)
@@ -168,6 +229,42 @@ class TextExceptionFormatter:
 
         return self.line_sep.join(result)
 
+    def evaluateSupplement(self, tbs, tb, deadline=None):
+        """Return the formatted lines of the traceback supplement `tbs`.
+
+        `deadline` is the time.perf_counter() value by which the budget of
+        the traceback is spent.
+        """
+        start = time.perf_counter()
+        if deadline is not None and start >= deadline:
+            return [self.formatSupplementSkipped()]
+        if self.frame_budget is not None:
+            frame_deadline = start + self.frame_budget
+            if deadline is None or frame_deadline < deadline:
+                deadline = frame_deadline
+        factory = tbs[0]
+        args = tbs[1:]
+        result = []
+        try:
+            supp = factory(*args)
+            if deadline is None:
+                result.extend(self.formatSupplement(supp, tb))
+            elif time.perf_counter() > deadline:
+                result.append(self.formatSupplementSkipped())
+            else:
+                budgeted = _BudgetedSupplement(supp, deadline)
+                result.extend(self.formatSupplement(budgeted, tb))
+                if budgeted._exceeded:
+                    result.append(self.formatSupplementSkipped())
+        except:  # noqa: E722 do not use bare 'except'
+            if DEBUG_EXCEPTION_FORMATTER:
+                import traceback
+                traceback.print_exc()
+            # else just swallow the exception.
+        if self.timings is not None:
+            self.timings.record(factory, time.perf_counter() - start)
+        return result
+
     def formatExceptionOnly(self, etype, value):
         import traceback
         return self.line_sep.join(
@@ -176,26 +273,129 @@ class TextExceptionFormatter:
     def formatLastLine(self, exc_line):
         return self.escape(exc_line)
 
-    def formatException(self, etype, value, tb, limit=None):
-        # The next line provides a way to detect recursion.
-        __exception_formatter__ = 1  # noqa
-        result = [self.getPrefix() + '\n']
+    def formatOmitted(self, count):
+        return self.escape('  (%d frames omitted)' % count)
+
+    def formatRepeats(self, period, repeats):
+        if period == 1:
+            s = '  [previous frame repeated %d times]' % repeats
+        else:
+            s = '  [previous %d frames repeated %d times]' % (period, repeats)
+        return self.escape(s)
+
+    def iterFormatException(self, etype, value, tb, limit=None, tail=None):
+        """Yield the lines of formatException one at a time.
+
+        Frames are only formatted when the caller consumes their line.  At
+        most `limit` frames are formatted from the outermost one.  If
+        `tail` is given, the innermost `tail` frames beyond the limit are
+        formatted as well, and only a count of the frames in between.
+
+        Long runs of repeated frames, as in deep recursion, are collapsed
+        to a single line when `elide_repeats` is set.
+        """
+        yield from self.iterFormatFrames(tb, limit=limit, tail=tail)
+        exc_line = self.formatExceptionOnly(etype, value)
+        yield self.formatLastLine(exc_line)
+
+    def iterFrames(self, tb, limit=None, tail=None):
+        """Yield the entries of the traceback `tb` to be formatted.
+
+        These are traceback objects, (count, 0) tuples for omitted frames
+        and (period, repeats) tuples for collapsed repetitions.  None is
+        yielded last if the traceback is one of a formatter, to stop
+        recursion.
+        """
         if limit is None:
             limit = self.getLimit()
-        n = 0
-        while tb is not None and (limit is None or n < limit):
-            if tb.tb_frame.f_locals.get('__exception_formatter__'):
-                # Stop recursion.
-                result.append('(Recursive formatException() stopped)\n')
-                break
-            line = self.formatLine(tb)
-            result.append(line + '\n')
+        if tail is None:
+            tail = self.tail
+        # Walking the traceback is cheap compared to formatting it.
+        tbs = []
+        while tb is not None:
+            tbs.append(tb)
             tb = tb.tb_next
-            n = n + 1
-        exc_line = self.formatExceptionOnly(etype, value)
-        result.append(self.formatLastLine(exc_line))
+        if self.elide_repeats:
+            plan = collapseRepeats(
+                [(tb.tb_frame.f_code, tb.tb_lineno) for tb in tbs],
+                self.min_repeats, self.max_period)
+        else:
+            plan = list(range(len(tbs)))
+        if limit is not None and len(plan) > limit:
+            rest = plan[limit:]
+            plan = plan[:limit]
+            if tail:
+                omitted = rest[:-tail]
+                if omitted:
+                    count = sum(1 if type(item) is int else
+                                item[0] * item[1] for item in omitted)
+                    plan.append((count, 0))
+                plan.extend(rest[-tail:])
+        for item in plan:
+            if type(item) is int:
+                tb = tbs[item]
+                if tb.tb_frame.f_locals.get('__exception_formatter__'):
+                    yield None
+                    break
+                yield tb
+            else:
+                yield item
+
+    def iterFormatFrames(self, tb, limit=None, tail=None):
+        """Yield the prefix and the frame lines of iterFormatException."""
+        # The next line provides a way to detect recursion.
+        __exception_formatter__ = 1  # noqa
+        yield self.getPrefix() + '\n'
+        deadline = None
+        if self.traceback_budget is not None:
+            deadline = time.perf_counter() + self.traceback_budget
+        for item in self.iterFrames(tb, limit, tail):
+            if item is None:
+                # Stop recursion.
+                yield '(Recursive formatException() stopped)\n'
+            elif type(item) is not tuple:
+                if deadline is None:
+                    yield self.formatLine(item) + '\n'
+                else:
+                    yield self.formatLine(item, deadline) + '\n'
+            elif item[1]:
+                yield self.formatRepeats(*item) + '\n'
+            else:
+                yield self.formatOmitted(item[0]) + '\n'
+
+    def formatException(self, etype, value, tb, limit=None):
+        return list(self.iterFormatException(etype, value, tb, limit=limit))
+
+    def formatSnapshot(self, snapshot, limit=None):
+        """Format a zExceptions.snapshot.TracebackSnapshot."""
+        result = list(self.iterFormatFrames(snapshot.traceback(), limit=limit))
+        result.append(self.formatLastLine(
+            self.line_sep.join(snapshot.exc_lines)))
         return result
 
+    def formatReference(self, ref, count):
+        if count > 1:
+            s = '  (Same as traceback %s, seen %d times)' % (ref, count)
+        else:
+            s = '  (Traceback %s)' % ref
+        return self.escape(s)
+
+    def addReference(self, result):
+        """Add a reference line to the formatted exception `result`.
+
+        Returns the reference id, computed from the frames only, as the
+        exception line may differ between repetitions.
+        """
+        ref = '%08x' % zlib.crc32(
+            ''.join(result[:-1]).encode('utf-8', 'replace'))
+        result.insert(1, self.formatReference(ref, 1) + '\n')
+        return ref
+
+    def formatRepeatedException(self, etype, value, ref, count):
+        return [self.getPrefix() + '\n',
+                self.formatReference(ref, count) + '\n',
+                self.formatLastLine(self.formatExceptionOnly(etype, value))]
+
 
 class HTMLExceptionFormatter(TextExceptionFormatter):
 
@@ -215,13 +415,25 @@ class HTMLExceptionFormatter(TextExceptionFormatter):
         s = s.replace('\n', self.line_sep)
         return '__traceback_info__: %s' % s
 
-    def formatLine(self, tb):
-        line = TextExceptionFormatter.formatLine(self, tb)
+    def formatLine(self, tb, deadline=None):
+        line = TextExceptionFormatter.formatLine(self, tb, deadline)
         return '<li>%s</li>' % line
 
     def formatLastLine(self, exc_line):
         return '</ul><p>%s</p>' % self.escape(exc_line)
 
+    def formatReference(self, ref, count):
+        line = TextExceptionFormatter.formatReference(self, ref, count)
+        return '<li>%s</li>' % line
+
+    def formatOmitted(self, count):
+        line = TextExceptionFormatter.formatOmitted(self, count)
+        return '<li>%s</li>' % line
+
+    def formatRepeats(self, period, repeats):
+        line = TextExceptionFormatter.formatRepeats(self, period, repeats)
+        return '<li>%s</li>' % line
+
     def formatExtraInfo(self, supplement):
         getInfo = getattr(supplement, 'getInfo', None)
         if getInfo is not None:
@@ -231,18 +443,308 @@ class HTMLExceptionFormatter(TextExceptionFormatter):
         return None
 
 
+def _str(value):
+    return None if value is None else str(value)
+
+
+class StructuredExceptionFormatter(TextExceptionFormatter):
+    """Format exceptions as dicts which can be serialized as JSON.
+
+    Frames are formatted as dicts with the module, line, function, file
+    name, supplement and traceback info.  Omitted frames, collapsed
+    repetitions and stopped recursion are entries with an ``omitted``,
+    ``repeated`` or ``recursion`` key instead.
+
+    iterFormatException yields the frame dicts followed by a dict with the
+    ``type`` and ``exception``.
+    """
+
+    def formatSupplementSkipped(self):
+        return {'skipped': 'time budget exceeded'}
+
+    def formatSupplement(self, supplement, tb):
+        object = getattr(supplement, 'object', None)
+        line = getattr(supplement, 'line', 0)
+        if line == -1:
+            line = tb.tb_lineno
+        warnings = getattr(supplement, 'warnings', None) or ()
+        return [{
+            'object': None if object is None else repr(object),
+            'url': _str(getattr(supplement, 'source_url', None)),
+            'line': line or None,
+            'column': getattr(supplement, 'column', None),
+            'expression': _str(getattr(supplement, 'expression', None)),
+            'warnings': [str(warning) for warning in warnings],
+            'extra': _str(self.formatExtraInfo(supplement)),
+        }]
+
+    def formatLine(self, tb, deadline=None):
+        f = tb.tb_frame
+        co = f.f_code
+        locals = f.f_locals
+        globals = f.f_globals
+        frame = {
+            'module': globals.get('__name__', co.co_filename),
+            'line': tb.tb_lineno,
+            'function': co.co_name,
+            'filename': co.co_filename,
+        }
+        revision = self.getRevision(globals)
+        if revision is not None:
+            frame['revision'] = revision
+        tbs = self.getSupplement(locals, globals)
+        if tbs is not None:
+            supplement = self.evaluateSupplement(tbs, tb, deadline)
+            if supplement:
+                frame['supplement'] = supplement[0]
+                for skipped in supplement[1:]:
+                    # getInfo() ran over the budget.
+                    frame['supplement'].update(skipped)
+        try:
+            tbi = locals.get('__traceback_info__', None)
+            if tbi is not None:
+                frame['traceback_info'] = str(tbi)
+        except:  # noqa: E722 do not use bare 'except'
+            pass
+        return frame
+
+    def iterFormatFrames(self, tb, limit=None, tail=None):
+        """Yield a dict per frame of the traceback `tb`."""
+        # The next line provides a way to detect recursion.
+        __exception_formatter__ = 1  # noqa
+        deadline = None
+        if self.traceback_budget is not None:
+            deadline = time.perf_counter() + self.traceback_budget
+        for item in self.iterFrames(tb, limit, tail):
+            if item is None:
+                yield {'recursion': True}
+            elif type(item) is not tuple:
+                yield self.formatLine(item, deadline)
+            elif item[1]:
+                yield {'repeated': item[1], 'period': item[0]}
+            else:
+                yield {'omitted': item[0]}
+
+    def formatFrames(self, tb, limit=None, tail=None):
+        """Return a list with a dict per frame of the traceback `tb`."""
+        return list(self.iterFormatFrames(tb, limit, tail))
+
+    def formatExceptionType(self, etype, value):
+        return {
+            'type': f'{etype.__module__}.{etype.__qualname__}',
+            'exception': self.formatExceptionOnly(etype, value).strip(),
+        }
+
+    def iterFormatException(self, etype, value, tb, limit=None, tail=None):
+        yield from self.iterFormatFrames(tb, limit=limit, tail=tail)
+        yield self.formatExceptionType(etype, value)
+
+    def formatException(self, etype, value, tb, limit=None):
+        result = self.formatExceptionType(etype, value)
+        result['frames'] = self.formatFrames(tb, limit)
+        return result
+
+    def formatReference(self, ref, count):
+        return {'reference': ref, 'count': count}
+
+    def addReference(self, result):
+        # The keys are sorted, so equal frames always give the same id.
+        ref = '%08x' % zlib.crc32(json.dumps(
+            result['frames'], sort_keys=True, default=str).encode('utf-8'))
+        result.update(self.formatReference(ref, 1))
+        return ref
+
+    def formatRepeatedException(self, etype, value, ref, count):
+        result = self.formatExceptionType(etype, value)
+        result.update(self.formatReference(ref, count))
+        return result
+
+    def formatSnapshot(self, snapshot, limit=None):
+        return {
+            'type': snapshot.exc_type,
+            'exception': ''.join(snapshot.exc_lines).strip(),
+            'frames': self.formatFrames(snapshot.traceback(), limit),
+        }
+
+
+class SupplementTimings:
+    """Time spent in traceback supplement factories.
+
+    Timings are kept per factory name, so the slow supplements can be found.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings = {}
+
+    def record(self, factory, seconds):
+        name = '{}.{}'.format(
+            getattr(factory, '__module__', None),
+            getattr(factory, '__qualname__', None) or repr(factory))
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                self._timings[name] = [1, seconds, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                if seconds > timing[2]:
+                    timing[2] = seconds
+
+    def stats(self):
+        """Return {factory name: {count, total, max}}, slowest first."""
+        with self._lock:
+            timings = sorted(self._timings.items(),
+                             key=lambda item: item[1][1], reverse=True)
+            return {name: {'count': count, 'total': total, 'max': max_}
+                    for name, (count, total, max_) in timings}
+
+    def clear(self):
+        with self._lock:
+            self._timings.clear()
+
+
 limit = 200
 
 if hasattr(sys, 'tracebacklimit'):
     limit = min(limit, sys.tracebacklimit)
 
-text_formatter = TextExceptionFormatter(limit)
-html_formatter = HTMLExceptionFormatter(limit)
+# Beyond the limit, still show the innermost frames.
+tail = 20
+
+supplement_timings = SupplementTimings()
+
+text_formatter = TextExceptionFormatter(
+    limit, tail, timings=supplement_timings)
+html_formatter = HTMLExceptionFormatter(
+    limit, tail, timings=supplement_timings)
+structured_formatter = StructuredExceptionFormatter(
+    limit, tail, timings=supplement_timings)
+
+
+def collapseRepeats(keys, min_repeats=20, max_period=8):
+    """Plan which frames to format given their (code, lineno) keys.
+
+    Returns a list of frame indexes.  A cycle of up to `max_period` frames
+    repeated at least `min_repeats` times in a row is kept once, followed
+    by a (period, repeats) tuple for the remaining repetitions.
+    """
+    n = len(keys)
+    if len(set(keys)) == n:
+        # Nothing repeats at all, the common case.
+        return list(range(n))
+    plan = []
+    i = 0
+    while i < n:
+        best_period = best_repeats = 1
+        for period in range(1, min(max_period, (n - i) // 2) + 1):
+            if keys[i] != keys[i + period]:
+                continue
+            cycle = keys[i:i + period]
+            repeats = 1
+            j = i + period
+            while keys[j:j + period] == cycle:
+                repeats += 1
+                j += period
+            if repeats * period > best_repeats * best_period:
+                best_period, best_repeats = period, repeats
+        if best_repeats >= max(min_repeats, 2):
+            plan.extend(range(i, i + best_period))
+            plan.append((best_period, best_repeats - 1))
+            i += best_period * best_repeats
+        else:
+            plan.append(i)
+            i += 1
+    return plan
+
+
+def fingerprint(etype, tb):
+    """Return a hashable fingerprint of a traceback.
+
+    Tracebacks raising the same exception type through the same code
+    locations have the same fingerprint, whatever the exception value.
+    """
+    frames = []
+    while tb is not None:
+        frames.append((tb.tb_frame.f_code, tb.tb_lineno))
+        tb = tb.tb_next
+    return (etype, tuple(frames))
+
+
+class _Seen:
+
+    __slots__ = ('ref', 'count', 'since')
+
+    def __init__(self, ref, since):
+        self.ref = ref
+        self.count = 1
+        self.since = since
+
+
+class TracebackDeduplicator:
+    """Format recently seen tracebacks as a reference to the first one.
+
+    The first occurrence of a traceback is formatted in full, including a
+    short reference id.  Repetitions within `interval` seconds are only
+    formatted as that reference, a repeat count and the exception line.
+    """
+
+    def __init__(self, maxsize=256, interval=300):
+        self.interval = interval
+        self.seen = LRUCache(maxsize)
+
+    def formatException(self, fmt, etype, value, tb, limit=None):
+        key = (fmt.__class__, limit, fingerprint(etype, tb))
+        now = time.monotonic()
+        seen = self.seen.get(key)
+        if seen is not None and now - seen.since < self.interval:
+            seen.count += 1
+            return fmt.formatRepeatedException(
+                etype, value, seen.ref, seen.count)
+        result = fmt.formatException(etype, value, tb, limit=limit)
+        ref = fmt.addReference(result)
+        self.seen.set(key, _Seen(ref, now))
+        return result
 
 
-def format_exception(t, v, tb, limit=None, as_html=0):
+deduplicator = TracebackDeduplicator()
+
+
+def format_snapshot(snapshot, limit=None, as_html=0):
+    if as_html:
+        fmt = html_formatter
+    else:
+        fmt = text_formatter
+    return fmt.formatSnapshot(snapshot, limit=limit)
+
+
+def iter_format_exception(t, v, tb, limit=None, as_html=0, tail=None):
     if as_html:
         fmt = html_formatter
     else:
         fmt = text_formatter
+    return fmt.iterFormatException(t, v, tb, limit=limit, tail=tail)
+
+
+def format_exception(t, v, tb, limit=None, as_html=0, dedupe=False):
+    if observers:
+        start = time.perf_counter()
+        result = _format_exception(t, v, tb, limit, as_html, dedupe)
+        notifyFormatted(t, v, time.perf_counter() - start)
+        return result
+    return _format_exception(t, v, tb, limit, as_html, dedupe)
+
+
+def _format_exception(t, v, tb, limit, as_html, dedupe):
+    if as_html:
+        fmt = html_formatter
+    else:
+        fmt = text_formatter
+    if dedupe:
+        return deduplicator.formatException(fmt, t, v, tb, limit=limit)
     return fmt.formatException(t, v, tb, limit=limit)
+
+
+def format_exception_structured(t, v, tb, limit=None):
+    """Return the exception as a dict which can be serialized as JSON."""
+    return structured_formatter.formatException(t, v, tb, limit=limit)
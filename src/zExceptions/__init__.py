@@ -16,15 +16,20 @@ These exceptions are so general purpose that they don't belong in Zope
 application-specific packages.
 """
 import builtins
+import sys
+import time
 
 from zope.interface import implementer
 from zope.interface.common.interfaces import IException
-from zope.publisher.interfaces import IBadRequest
-from zope.publisher.interfaces import INotFound
-from zope.publisher.interfaces import IRedirect
-from zope.publisher.interfaces.http import IHTTPException
-from zope.publisher.interfaces.http import IMethodNotAllowed
-from zope.security.interfaces import IForbidden
+
+from zExceptions.cache import LRUCache
+from zExceptions.headers import HTTPHeaders
+from zExceptions.instrumentation import notifyRendered
+from zExceptions.instrumentation import observers
+from zExceptions.lazyinterfaces import lazy_implementer
+from zExceptions.rendering import html_renderer
+from zExceptions.rendering import negotiate
+from zExceptions.template import CompiledTemplate
 
 
 status_reasons = {
@@ -95,6 +100,40 @@ status_reasons = {
     511: 'Network Authentication Required',
 }
 
+# Interned WSGI status lines, e.g. '404 Not Found'.
+status_lines = {
+    status: sys.intern('%d %s' % (status, reason))
+    for status, reason in status_reasons.items()
+}
+
+# HTTPException subclasses indexed by status code, filled in by
+# HTTPException.__init_subclass__.
+status_map = [None] * 600
+
+
+def _registerStatus(cls):
+    status = cls.status
+    if not isinstance(status, int) or not 0 <= status < len(status_map):
+        return
+    current = status_map[status]
+    if current is None:
+        # Only classes declaring a status of their own claim it, so
+        # abstract bases like HTTPRedirection do not take over 500.
+        if 'status' in cls.__dict__:
+            status_map[status] = cls
+    elif issubclass(cls, current) and cls.__module__ == current.__module__:
+        # A more specific class from the same module, e.g. BadRequest
+        # replacing HTTPClientError.  Subclasses defined elsewhere do not
+        # hijack the status.
+        status_map[status] = cls
+
+
+def exception_for_status(status):
+    """Return the exception class registered for `status` or None."""
+    if 0 <= status < len(status_map):
+        return status_map[status]
+    return None
+
 
 ERROR_HTML = """\
 <!DOCTYPE html>
@@ -126,18 +165,100 @@ Thank you for your patience.
 </p>
 </body></html>"""
 
+# Rendered and encoded error bodies, keyed on
+# (class, renderer, body_template, status, errmsg, title, detail).
+body_cache = LRUCache(256)
+
+# Bodies larger than this are rendered on every call instead of cached.
+MAX_CACHED_BODY_SIZE = 16384
+
+# (name, value) -> (lower cased name, value) encoded for ASGI.
+header_cache = LRUCache(256)
+
+
+def _encodeHeaders(headers):
+    result = []
+    for header in headers:
+        encoded = header_cache.get(header)
+        if encoded is None:
+            name, value = header
+            encoded = (name.lower().encode('latin-1'),
+                       str(value).encode('latin-1'))
+            header_cache.set(header, encoded)
+        result.append(encoded)
+    return result
+
 
-@implementer(IHTTPException)
+class _EncodedBody:
+    """WSGI response iterable encoding the chunks of a body lazily."""
+
+    __slots__ = ('_chunks',)
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            yield chunk
+
+    def close(self):
+        close = getattr(self._chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+@lazy_implementer('zope.publisher.interfaces.http', 'IHTTPException')
 class HTTPException(Exception):
+    # Headers, like status or body set on an instance, are kept in the
+    # instance dict.  CPython only allocates it when the first attribute is
+    # set, and looking up a missing instance attribute with a getattr
+    # default does not raise internally, unlike reading an unset slot.
+
     body = None
     body_template = ERROR_HTML
+    _compiled_template = CompiledTemplate(ERROR_HTML)
+    cache_body = True
+    default_headers = (('content-type', 'text/html;charset=utf-8'),)
     detail = None
     empty_body = False
     errmsg = 'Internal Server Error'
     status = 500
     title = 'Sorry, a site error occurred.'
 
+    def __init_subclass__(cls, **kw):
+        super().__init_subclass__(**kw)
+        _registerStatus(cls)
+        template = cls.__dict__.get('body_template')
+        if template is not None:
+            # Compiling validates the template when the class is defined.
+            cls._compiled_template = CompiledTemplate(template)
+
+    def __reduce__(self):
+        # BaseException.__reduce__ only saves args and the instance dict.
+        return (self.__class__, self.args, self.__getstate__())
+
+    def __getstate__(self):
+        """Return the instance dict and the values of all set slots."""
+        state = dict(self.__dict__)
+        for cls in self.__class__.__mro__:
+            slots = cls.__dict__.get('__slots__', ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            for name in slots:
+                try:
+                    state[name] = cls.__dict__[name].__get__(self)
+                except AttributeError:
+                    pass
+        return state
+
     def setBody(self, body):
+        """Set the response body.
+
+        `body` is either a string or an iterable of str or bytes chunks.
+        Iterables are encoded chunk by chunk while the response is sent.
+        """
         self.body = body
 
     def getStatus(self):
@@ -151,35 +272,185 @@ class HTTPException(Exception):
             reason = reason
         self.errmsg = reason
 
+    def _getHeaderStore(self):
+        headers = getattr(self, 'headers', None)
+        if not isinstance(headers, HTTPHeaders):
+            # Also converts a plain dict assigned by older code.
+            headers = self.headers = HTTPHeaders(headers or ())
+        return headers
+
     def setHeader(self, name, value):
-        if not hasattr(self, 'headers'):
-            self.headers = {}
-        self.headers[name] = value
+        self._getHeaderStore().set(name, value)
 
-    def __call__(self, environ, start_response):
-        headers = list(getattr(self, 'headers', {}).items())
-        if not self.empty_body and \
-                'content-type' not in getattr(self, 'headers', {}):
-            headers.append(('content-type', 'text/html;charset=utf-8'))
-        reason = status_reasons[self.getStatus()]
-        start_response(
-            '%d %s' % (self.getStatus(), reason),
-            headers)
+    def addHeader(self, name, value):
+        self._getHeaderStore().add(name, value)
 
-        if self.empty_body:
-            return []
+    def getHeader(self, name, default=None):
+        headers = getattr(self, 'headers', None)
+        if not headers:
+            return default
+        return self._getHeaderStore().get(name, default)
+
+    def removeHeader(self, name):
+        if getattr(self, 'headers', None):
+            self._getHeaderStore().remove(name)
 
+    def _getResponseHeaders(self, content_length=None, content_type=None):
+        extra = getattr(self, 'headers', None)
+        if extra and not isinstance(extra, HTTPHeaders):
+            extra = self._getHeaderStore()
+        if self.empty_body:
+            return extra.items() if extra else []
+        defaults = self.default_headers
+        if content_type is not None:
+            defaults = [('content-type', content_type)] + [
+                (name, value) for name, value in defaults
+                if name != 'content-type']
+        if not extra:
+            # WSGI servers may mutate the list, so never hand out
+            # the shared tuple itself.
+            headers = list(defaults)
+        else:
+            headers = extra.items()
+            for name, value in defaults:
+                if name not in extra:
+                    headers.append((name, value))
+            if 'content-length' in extra:
+                content_length = None
+        if self.body is None and not (extra and 'content-type' in extra):
+            # The body is negotiated from the Accept request header.
+            vary = extra.get('vary') if extra else None
+            if vary is None:
+                headers.append(('vary', 'Accept'))
+            elif 'accept' not in [v.strip().lower() for v in vary.split(',')]:
+                for i, (name, value) in enumerate(headers):
+                    if name.lower() == 'vary':
+                        headers[i] = (name, value + ', Accept')
+                        break
+        if content_length is not None:
+            headers.append(('content-length', str(content_length)))
+        return headers
+
+    def _getResponseBody(self, accept=None):
+        """Return the encoded body and its content type.
+
+        The body is bytes or an iterable of bytes.  The content type is None
+        if the one from `default_headers` applies.  The body is only
+        negotiated when neither it nor a content type header was set.
+        """
         body = self.body
         if body is None:
             message = str(self)
             detail = self.detail if self.detail is not None else message
-            if self.title and detail:
-                body = self.body_template.format(
-                    title=self.title, detail=detail)
-                body = body
+            if accept and self.getHeader('content-type') is None:
+                renderer = negotiate(accept)
             else:
-                body = message
-        return [body.encode('utf-8')]
+                renderer = html_renderer
+            if renderer is not html_renderer:
+                return (self._renderBody(renderer, self.title, detail),
+                        renderer.content_type)
+            if self.title and detail:
+                return self._renderBody(renderer, self.title, detail), None
+            body = message
+        if isinstance(body, str):
+            return body.encode('utf-8'), None
+        if isinstance(body, (bytes, bytearray)):
+            return bytes(body), None
+        return _EncodedBody(body), None
+
+    def __call__(self, environ, start_response):
+        if not observers:
+            return self._respond(environ, start_response)
+        start = time.perf_counter()
+        result = self._respond(environ, start_response)
+        notifyRendered(self, time.perf_counter() - start)
+        return result
+
+    def _getStatusLine(self):
+        status = self.getStatus()
+        line = status_lines.get(status)
+        if line is None:
+            # A status set through setStatus() or raise_for_status() that
+            # has no registered reason phrase.
+            line = '%d %s' % (status, self.errmsg)
+        return line
+
+    def _respond(self, environ, start_response):
+        if self.empty_body:
+            start_response(self._getStatusLine(),
+                           self._getResponseHeaders())
+            return []
+
+        body, content_type = self._getResponseBody(
+            environ.get('HTTP_ACCEPT'))
+        if type(body) is bytes:
+            # Lets servers avoid chunked encoding or closing the connection.
+            start_response(self._getStatusLine(),
+                           self._getResponseHeaders(len(body), content_type))
+            return [body]
+        start_response(self._getStatusLine(),
+                       self._getResponseHeaders(None, content_type))
+        return body
+
+    async def asgi(self, scope, receive, send):
+        """Send the exception as the response to an ASGI HTTP request.
+
+        The body and headers are the same as for the WSGI response.
+        """
+        if not observers:
+            return await self._asgiRespond(scope, send)
+        start = time.perf_counter()
+        await self._asgiRespond(scope, send)
+        notifyRendered(self, time.perf_counter() - start)
+
+    async def _asgiRespond(self, scope, send):
+        if self.empty_body:
+            await send({'type': 'http.response.start',
+                        'status': self.getStatus(),
+                        'headers': _encodeHeaders(
+                            self._getResponseHeaders())})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        accept = None
+        for name, value in scope.get('headers', ()):
+            if name == b'accept':
+                accept = value.decode('latin-1')
+                break
+        body, content_type = self._getResponseBody(accept)
+        if type(body) is bytes:
+            await send({'type': 'http.response.start',
+                        'status': self.getStatus(),
+                        'headers': _encodeHeaders(self._getResponseHeaders(
+                            len(body), content_type))})
+            await send({'type': 'http.response.body', 'body': body})
+            return
+        await send({'type': 'http.response.start',
+                    'status': self.getStatus(),
+                    'headers': _encodeHeaders(
+                        self._getResponseHeaders(None, content_type))})
+        try:
+            for chunk in body:
+                await send({'type': 'http.response.body', 'body': chunk,
+                            'more_body': True})
+        finally:
+            body.close()
+        await send({'type': 'http.response.body', 'body': b''})
+
+    def _renderBody(self, renderer, title, detail):
+        errmsg = self.errmsg
+        if not self.cache_body or not renderer.cache or \
+                type(title) is not str or \
+                type(detail) is not str or type(errmsg) is not str:
+            return renderer.render(self, title, detail).encode('utf-8')
+        key = (self.__class__, renderer, self.body_template,
+               self.getStatus(), errmsg, title, detail)
+        body = body_cache.get(key)
+        if body is None:
+            body = renderer.render(self, title, detail).encode('utf-8')
+            if len(body) <= MAX_CACHED_BODY_SIZE:
+                body_cache.set(key, body)
+        return body
 
 
 class HTTPOk(HTTPException):
@@ -252,7 +523,7 @@ class HTTPMovedPermanently(_HTTPMove):
     status = 301
 
 
-@implementer(IRedirect)
+@lazy_implementer('zope.publisher.interfaces', 'IRedirect')
 class Redirect(_HTTPMove):
     errmsg = 'Found'
     status = 302
@@ -297,7 +568,7 @@ class HTTPClientError(HTTPError):
     status = 400
 
 
-@implementer(IBadRequest)
+@lazy_implementer('zope.publisher.interfaces', 'IBadRequest')
 class BadRequest(HTTPClientError):
     pass
 
@@ -317,7 +588,7 @@ class HTTPPaymentRequired(HTTPClientError):
     status = 402
 
 
-@implementer(IForbidden)
+@lazy_implementer('zope.security.interfaces', 'IForbidden')
 class Forbidden(HTTPException):
     errmsg = 'Forbidden'
     status = 403
@@ -326,7 +597,7 @@ class Forbidden(HTTPException):
 HTTPForbidden = Forbidden  # Alias
 
 
-@implementer(INotFound)
+@lazy_implementer('zope.publisher.interfaces', 'INotFound')
 class NotFound(HTTPException):
     errmsg = 'Not Found'
     status = 404
@@ -335,7 +606,7 @@ class NotFound(HTTPException):
 HTTPNotFound = NotFound  # Alias
 
 
-@implementer(IMethodNotAllowed)
+@lazy_implementer('zope.publisher.interfaces.http', 'IMethodNotAllowed')
 class MethodNotAllowed(HTTPException):
     errmsg = 'Method Not Allowed'
     status = 405
@@ -507,17 +778,73 @@ class HTTPNetworkAuthenticationRequired(HTTPServerError):
     status = 511
 
 
+def raise_for_status(status, detail=None):
+    """Raise the exception matching the error `status`.
+
+    Nothing is raised for statuses below 400.  Error statuses without a
+    dedicated class raise HTTPClientError or HTTPServerError with the status
+    set accordingly.
+    """
+    if status < 400:
+        return
+    if status >= len(status_map):
+        raise ValueError(f'Invalid HTTP status: {status!r}')
+    cls = status_map[status]
+    if cls is None:
+        cls = HTTPClientError if status < 500 else HTTPServerError
+    exc = cls() if detail is None else cls(detail)
+    if exc.status != status:
+        exc.setStatus(status)
+    raise exc
+
+
+# Maps exception names to classes for convertExceptionType.  Built on
+# first use from builtins and this module, see _buildExceptionTypes.
+_exception_types = None
+_registered_exception_types = {}
+
+
+def _isExceptionType(etype):
+    return isinstance(etype, type) and issubclass(etype, Exception)
+
+
+def _buildExceptionTypes():
+    global _exception_types
+    types = {}
+    # Later updates win, so builtins take precedence over this module and
+    # explicitly registered types take precedence over both.
+    for namespace in (globals(), builtins.__dict__,
+                      _registered_exception_types):
+        for name, etype in list(namespace.items()):
+            if _isExceptionType(etype):
+                types[name] = etype
+    _exception_types = types
+    return types
+
+
+def register_exception_type(name, cls):
+    """Make `convertExceptionType` return `cls` for `name`.
+
+    This allows add-on packages to extend the mapping used by
+    `upgradeException`.
+    """
+    global _exception_types
+    if not _isExceptionType(cls):
+        raise TypeError(f'{cls!r} is not an exception class')
+    _registered_exception_types[name] = cls
+    _exception_types = None
+
+
 def convertExceptionType(name):
-    import zExceptions
-    etype = None
-    if name in builtins.__dict__:
-        etype = getattr(builtins, name)
-    elif hasattr(zExceptions, name):
-        etype = getattr(zExceptions, name)
-    if (etype is not None and
-            isinstance(etype, type) and
-            issubclass(etype, Exception)):
-        return etype
+    types = _exception_types
+    if types is None:
+        types = _buildExceptionTypes()
+    etype = types.get(name)
+    if etype is None and _isExceptionType(globals().get(name)):
+        # An exception class assigned to this module after the mapping was
+        # built.  Other unknown names need no further probing.
+        etype = _buildExceptionTypes().get(name)
+    return etype
 
 
 def upgradeException(t, v):
@@ -0,0 +1,157 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Format tracebacks in background threads.
+
+The failing thread takes a ``TracebackSnapshot``, evaluating the
+supplements, and worker threads format it.  Formatters created with
+`evaluate_in_worker` only copy the frame data and evaluate the supplements
+in the worker too, after the request may have ended.  Supplements reading
+persistent objects, like the ``PathTracebackSupplement`` of Zope, are not
+safe to evaluate there: their ZODB connection may already be closed or
+used by another thread.
+"""
+
+import queue
+import threading
+import traceback
+from concurrent.futures import Future
+
+from zExceptions.ExceptionFormatter import html_formatter
+from zExceptions.ExceptionFormatter import text_formatter
+from zExceptions.snapshot import TracebackSnapshot
+from zExceptions.snapshot import copyTraceback
+
+
+class FormattingDropped(Exception):
+    """The traceback was not formatted because the queue was full."""
+
+
+class AsyncExceptionFormatter:
+    """Format exceptions in a pool of worker threads.
+
+    At most `maxsize` exceptions wait to be formatted.  When the queue is
+    full, `submit` never blocks: it drops the new exception, or the oldest
+    waiting one if `drop_oldest` is set.  The future of a dropped exception
+    raises FormattingDropped.
+
+    Supplements are evaluated in the calling thread, unless
+    `evaluate_in_worker` is set, see the module docstring.
+    """
+
+    def __init__(self, workers=1, maxsize=100, drop_oldest=False,
+                 evaluate_in_worker=False):
+        self.workers = workers
+        self.drop_oldest = drop_oldest
+        self.evaluate_in_worker = evaluate_in_worker
+        self.submitted = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def _start(self):
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError('The formatter has been shut down.')
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._work, name=f'zExceptions-formatter-{i}',
+                    daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            future, fmt, tb, exc_lines, limit = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = list(fmt.iterFormatFrames(tb, limit=limit))
+                result.append(fmt.formatLastLine(fmt.line_sep.join(exc_lines)))
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def _drop(self, future):
+        self.dropped += 1
+        future.set_exception(FormattingDropped())
+
+    def submit(self, etype, value, tb, limit=None, as_html=0):
+        """Queue an exception for formatting.
+
+        Returns a future for the result of `format_exception`.
+
+        With `evaluate_in_worker` set, the supplements of `tb` are called
+        in a worker thread after this returns.  Do not use it for
+        supplements accessing the ZODB or other per-request state; the
+        default evaluates them here, as TracebackSnapshot.capture does.
+        """
+        if not self._threads or self._shutdown:
+            self._start()
+        fmt = html_formatter if as_html else text_formatter
+        future = Future()
+        if self.evaluate_in_worker:
+            job = (future, fmt, copyTraceback(tb),
+                   traceback.format_exception_only(etype, value), limit)
+        else:
+            snapshot = TracebackSnapshot.capture(etype, value, tb)
+            job = (future, fmt, snapshot.traceback(), snapshot.exc_lines,
+                   limit)
+        self.submitted += 1
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            if not self.drop_oldest:
+                self._drop(future)
+                return future
+            try:
+                oldest = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                if oldest[0].set_running_or_notify_cancel():
+                    self._drop(oldest[0])
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self._drop(future)
+        return future
+
+    def shutdown(self, wait=True):
+        """Stop the workers after the queued exceptions are formatted."""
+        with self._lock:
+            self._shutdown = True
+            threads = self._threads
+            self._threads = []
+        for thread in threads:
+            self._queue.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+async_formatter = AsyncExceptionFormatter()
+
+
+def format_exception_async(t, v, tb, limit=None, as_html=0):
+    """Return a future for `format_exception` formatted in the background.
+    """
+    return async_formatter.submit(t, v, tb, limit=limit, as_html=as_html)
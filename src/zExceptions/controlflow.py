@@ -0,0 +1,89 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Preallocated exceptions for control flow.
+
+Security checks raise ``Unauthorized`` and the caller often catches it
+right away, e.g. to skip an object the user may not see.  Creating an
+``Unauthorized`` does some work in ``__init__``, so raising a preallocated
+instance is cheaper::
+
+  raise ControlFlowUnauthorized.instance()
+
+There are no such variants of ``NotFound`` or ``Forbidden``: creating those
+is cheaper than preparing a preallocated instance, see
+``benchmarks/bench_suite.py -k raise_``.
+
+The instance is a subclass of ``Unauthorized``, so ``except Unauthorized``
+still catches it.  It carries no message, and as it is shared, it must not
+be modified, e.g. with ``setHeader``.  Raise a normal instance for errors
+which are shown to the user.
+
+Python attaches the traceback while the exception propagates and does not
+detach it when the exception is caught, so the instance references the
+frames of its last raise, and their local variables.  ``instance()``
+drops them before the next raise, which bounds this to one traceback per
+thread.  Call ``clear()`` once the exception is handled to release them
+right away::
+
+  try:
+      checkPermission(obj)
+  except ControlFlowUnauthorized as exc:
+      exc.clear()
+      obj = None
+"""
+
+import threading
+
+from zExceptions import Unauthorized
+
+
+_local = threading.local()
+
+
+class ControlFlowException:
+    """Mixin for exceptions with a shared instance per thread."""
+
+    __slots__ = ()
+
+    @classmethod
+    def instance(cls):
+        """Return the instance of this thread, ready to be raised.
+
+        Raising an instance adds to its traceback, so the traceback, the
+        context and the cause of the previous raise are cleared.  Only the
+        traceback of the last raise stays referenced.
+        """
+        try:
+            instances = _local.instances
+        except AttributeError:
+            instances = _local.instances = {}
+        exc = instances.get(cls)
+        if exc is None:
+            exc = instances[cls] = cls()
+        else:
+            exc.clear()
+        return exc
+
+    def clear(self):
+        """Drop the traceback, the context and the cause of the last raise.
+
+        This releases the frames of the raise and their local variables.
+        """
+        self.__traceback__ = None
+        self.__context__ = None
+        self.__cause__ = None
+
+
+class ControlFlowUnauthorized(ControlFlowException, Unauthorized):
+    __slots__ = ()
@@ -0,0 +1,155 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Response header storage for HTTP exceptions.
+"""
+
+_marker = object()
+
+
+class HTTPHeaders:
+    """An ordered, case-insensitive collection of response headers.
+
+    Headers are kept as a list of (name, value) pairs in the order they
+    were added, so repeated headers like ``Set-Cookie`` are supported.
+    An index from the lower cased name to the first value makes lookups
+    O(1).  It is only built on the first lookup, so exceptions which are
+    never rendered do not pay for it.  Item access behaves like a dict of
+    the first values.
+    """
+
+    __slots__ = ('_items', '_index')
+
+    def __init__(self, headers=()):
+        self._items = []
+        self._index = None
+        if hasattr(headers, 'items'):
+            headers = headers.items()
+        for name, value in headers:
+            self.add(name, value)
+
+    def _getIndex(self):
+        index = self._index
+        if index is None:
+            index = {}
+            for name, value in self._items:
+                index.setdefault(name.lower(), value)
+            self._index = index
+        return index
+
+    def get(self, name, default=None):
+        return self._getIndex().get(name.lower(), default)
+
+    def getAll(self, name):
+        key = name.lower()
+        if key not in self._getIndex():
+            return []
+        return [v for n, v in self._items if n.lower() == key]
+
+    def set(self, name, value):
+        """Set `name` to `value`, replacing all existing values."""
+        key = name.lower()
+        if self._index is None:
+            present = any(n.lower() == key for n, v in self._items)
+        else:
+            present = key in self._index
+        if not present:
+            self.add(name, value)
+            return
+        index = self._getIndex()
+        items = []
+        for item in self._items:
+            if item[0].lower() != key:
+                items.append(item)
+            elif key in index:
+                # Keep the position of the first occurrence.
+                items.append((name, value))
+                del index[key]
+        self._items = items
+        index[key] = value
+
+    def add(self, name, value):
+        """Add a value for `name`, keeping existing values."""
+        self._items.append((name, value))
+        if self._index is not None:
+            self._index.setdefault(name.lower(), value)
+
+    def remove(self, name):
+        """Remove all values for `name`, return whether there were any."""
+        key = name.lower()
+        if self._getIndex().pop(key, _marker) is _marker:
+            return False
+        self._items = [item for item in self._items
+                       if item[0].lower() != key]
+        return True
+
+    def items(self):
+        """Return a new list of all (name, value) pairs."""
+        return list(self._items)
+
+    def keys(self):
+        seen = set()
+        names = []
+        for name, value in self._items:
+            key = name.lower()
+            if key not in seen:
+                seen.add(key)
+                names.append(name)
+        return names
+
+    def copy(self):
+        new = self.__class__()
+        new._items = list(self._items)
+        if self._index is not None:
+            new._index = dict(self._index)
+        return new
+
+    def __reduce__(self):
+        return (self.__class__, (self._items,))
+
+    def __getitem__(self, name):
+        value = self._getIndex().get(name.lower(), _marker)
+        if value is _marker:
+            raise KeyError(name)
+        return value
+
+    __setitem__ = set
+
+    def __delitem__(self, name):
+        if not self.remove(name):
+            raise KeyError(name)
+
+    def __contains__(self, name):
+        try:
+            return name.lower() in self._getIndex()
+        except AttributeError:
+            return False
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self._items)
+
+    def __eq__(self, other):
+        if isinstance(other, HTTPHeaders):
+            return self._items == other._items
+        if isinstance(other, dict):
+            return (len(other) == len(self._items) and
+                    all(other.get(n, _marker) == v for n, v in self._items))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._items!r})'
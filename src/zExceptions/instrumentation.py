@@ -0,0 +1,146 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Observers of rendered HTTP exceptions and formatted tracebacks.
+
+Observers are only called when registered.  Without observers, the
+rendering and formatting code only checks whether the `observers` list is
+empty.  Errors raised by observers are logged and otherwise ignored, so
+they never turn a rendered error into a crash.
+"""
+
+import logging
+import threading
+from collections import deque
+
+
+logger = logging.getLogger('zExceptions.instrumentation')
+
+# Registered observers, in registration order.
+observers = []
+
+
+class ExceptionObserver:
+    """Base class for observers, ignoring all events."""
+
+    def rendered(self, exc, seconds):
+        """`exc` was rendered as a WSGI response in `seconds`.
+
+        Streamed bodies are only counted until their iterable is returned.
+        """
+
+    def formatted(self, etype, value, seconds):
+        """A traceback of an `etype` exception was formatted in `seconds`.
+        """
+
+
+def register_observer(observer):
+    if observer not in observers:
+        observers.append(observer)
+
+
+def unregister_observer(observer):
+    if observer in observers:
+        observers.remove(observer)
+
+
+def notifyRendered(exc, seconds):
+    for observer in list(observers):
+        try:
+            observer.rendered(exc, seconds)
+        except Exception:
+            logger.exception('Observer %r failed', observer)
+
+
+def notifyFormatted(etype, value, seconds):
+    for observer in list(observers):
+        try:
+            observer.formatted(etype, value, seconds)
+        except Exception:
+            logger.exception('Observer %r failed', observer)
+
+
+def percentiles(samples, points=(50, 90, 99)):
+    """Return {'pNN': value} for the given percentile points."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    result = {'p%d' % point: ordered[round(last * point / 100)]
+              for point in points}
+    result['max'] = ordered[-1]
+    return result
+
+
+def _name(cls):
+    return f'{cls.__module__}.{cls.__qualname__}'
+
+
+class _Counter:
+
+    __slots__ = ('count', 'by_status', 'by_class', 'latencies')
+
+    def __init__(self, samples):
+        self.count = 0
+        self.by_status = {}
+        self.by_class = {}
+        self.latencies = deque(maxlen=samples)
+
+    def add(self, cls, status, seconds):
+        self.count += 1
+        if status is not None:
+            self.by_status[status] = self.by_status.get(status, 0) + 1
+        name = _name(cls)
+        self.by_class[name] = self.by_class.get(name, 0) + 1
+        self.latencies.append(seconds)
+
+    def dump(self):
+        result = {
+            'count': self.count,
+            'by_class': dict(self.by_class),
+            'latency': percentiles(self.latencies),
+        }
+        if self.by_status:
+            result['by_status'] = dict(self.by_status)
+        return result
+
+
+class StatsObserver(ExceptionObserver):
+    """Count events per status code and class and keep latency samples.
+
+    Percentiles are computed from the last `samples` latencies.
+    """
+
+    def __init__(self, samples=1000):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self.clear()
+
+    def rendered(self, exc, seconds):
+        with self._lock:
+            self._rendered.add(exc.__class__, exc.getStatus(), seconds)
+
+    def formatted(self, etype, value, seconds):
+        with self._lock:
+            self._formatted.add(etype, None, seconds)
+
+    def dump(self):
+        """Return the statistics as a dict."""
+        with self._lock:
+            return {'rendered': self._rendered.dump(),
+                    'formatted': self._formatted.dump()}
+
+    def clear(self):
+        with self._lock:
+            self._rendered = _Counter(self.samples)
+            self._formatted = _Counter(self.samples)
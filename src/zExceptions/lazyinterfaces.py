@@ -0,0 +1,104 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Declare interfaces of classes once the interface modules are imported.
+
+Importing ``zope.publisher.interfaces`` and ``zope.security.interfaces``
+pulls in much of the publisher and security machinery.  The exception
+classes only declare that they implement some of their interfaces, which
+is irrelevant until something imports these interfaces to check them.
+"""
+
+import sys
+import threading
+
+from zope.interface import classImplements
+
+
+# module name -> [(class, interface name)] waiting for the module.
+_pending = {}
+_lock = threading.RLock()
+
+
+def _declare(module, declarations):
+    for cls, name in declarations:
+        classImplements(cls, getattr(module, name))
+
+
+class _DeclaringLoader:
+    """Wrap a loader to declare the pending interfaces after loading."""
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._loader.exec_module(module)
+        with _lock:
+            declarations = _pending.pop(module.__name__, ())
+            if not _pending:
+                _uninstall()
+        _declare(module, declarations)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _DeclaringFinder:
+    """Meta path finder hooking into the import of the pending modules."""
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname not in _pending:
+            return None
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, 'find_spec', None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if getattr(spec.loader, 'exec_module', None) is not None:
+            spec.loader = _DeclaringLoader(spec.loader)
+        return spec
+
+
+_finder = _DeclaringFinder()
+
+
+def _uninstall():
+    if _finder in sys.meta_path:
+        sys.meta_path.remove(_finder)
+
+
+def lazy_implementer(module_name, interface_name):
+    """Class decorator declaring an interface from a module not imported yet.
+
+    The declaration is made when `module_name` is imported, or right away
+    if it already is.
+    """
+    def decorator(cls):
+        module = sys.modules.get(module_name)
+        if module is not None and hasattr(module, interface_name):
+            _declare(module, [(cls, interface_name)])
+            return cls
+        with _lock:
+            _pending.setdefault(module_name, []).append(
+                (cls, interface_name))
+            if _finder not in sys.meta_path:
+                sys.meta_path.insert(0, _finder)
+        return cls
+    return decorator
@@ -0,0 +1,161 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Content negotiated rendering of HTTP exception bodies.
+
+The renderer is chosen from the ``Accept`` request header.  HTML stays the
+default, other renderers are only used when the client prefers them.
+"""
+
+import json
+
+from zExceptions.cache import LRUCache
+from zExceptions.template import compileTemplate
+
+
+class ErrorRenderer:
+    """Render the body of an HTTP exception for one media type.
+
+    `render` is called with the exception, its title and its detail and
+    returns a string.
+
+    Rendered bodies are cached by exception class, renderer, body
+    template, status, errmsg, title and detail.  A renderer using anything
+    else from the exception must be created with `cache` set to False.
+    """
+
+    __slots__ = ('media_type', 'content_type', 'render', 'cache')
+
+    def __init__(self, media_type, content_type, render, cache=True):
+        self.media_type = media_type
+        self.content_type = content_type
+        self.render = render
+        self.cache = cache
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.media_type}>'
+
+
+def renderHTML(exc, title, detail):
+    template = exc.body_template
+    compiled = getattr(exc, '_compiled_template', None)
+    if compiled is None or compiled.source is not template:
+        # The template was overridden on the instance.
+        compiled = compileTemplate(template)
+    return compiled.render(title=title, detail=detail)
+
+
+def renderJSON(exc, title, detail):
+    return json.dumps(
+        {'status': exc.getStatus(), 'error': str(exc.errmsg),
+         'detail': str(detail)},
+        ensure_ascii=False, separators=(',', ':'))
+
+
+def renderText(exc, title, detail):
+    if detail:
+        return f'{exc.getStatus()} {exc.errmsg}\n\n{detail}\n'
+    return f'{exc.getStatus()} {exc.errmsg}\n'
+
+
+html_renderer = ErrorRenderer(
+    'text/html', 'text/html;charset=utf-8', renderHTML)
+
+# Registered renderers in order of preference when the client accepts
+# several of them equally.
+renderers = [
+    html_renderer,
+    ErrorRenderer('application/json', 'application/json', renderJSON),
+    ErrorRenderer('text/plain', 'text/plain;charset=utf-8', renderText),
+]
+
+# Accept header value -> chosen renderer.
+_negotiated = LRUCache(128)
+
+
+def register_renderer(media_type, render, content_type=None, cache=True):
+    """Register `render` for `media_type`, replacing an existing renderer.
+
+    Pass `cache` as False if `render` uses more of the exception than
+    ErrorRenderer caches the body by.
+    """
+    if content_type is None:
+        content_type = media_type
+    renderer = ErrorRenderer(media_type, content_type, render, cache)
+    for i, existing in enumerate(renderers):
+        if existing.media_type == media_type:
+            renderers[i] = renderer
+            break
+    else:
+        renderers.append(renderer)
+    _negotiated.clear()
+    return renderer
+
+
+def parseAccept(accept):
+    """Return a list of (media range, quality) pairs."""
+    result = []
+    for part in accept.split(','):
+        media_range, _, params = part.partition(';')
+        media_range = media_range.strip().lower()
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        result.append((media_range, quality))
+    return result
+
+
+def _match(media_type, accepted):
+    # Return (quality, specificity) of the best matching media range.
+    major = media_type.split('/')[0] + '/*'
+    best = (0.0, -1)
+    for media_range, quality in accepted:
+        if media_range == media_type:
+            specificity = 2
+        elif media_range == major:
+            specificity = 1
+        elif media_range == '*/*':
+            specificity = 0
+        else:
+            continue
+        if specificity > best[1]:
+            best = (quality, specificity)
+    return best
+
+
+def negotiate(accept):
+    """Return the renderer best matching the `accept` header value.
+
+    Falls back to HTML when nothing else is acceptable.
+    """
+    if not accept:
+        return html_renderer
+    renderer = _negotiated.get(accept)
+    if renderer is None:
+        accepted = parseAccept(accept)
+        renderer = html_renderer
+        best = (0.0, -1)
+        for candidate in renderers:
+            quality, specificity = _match(candidate.media_type, accepted)
+            if quality > 0 and (quality, specificity) > best:
+                renderer = candidate
+                best = (quality, specificity)
+        _negotiated.set(accept, renderer)
+    return renderer
@@ -0,0 +1,249 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Copies of tracebacks which do not keep the frames alive.
+
+The copies provide the traceback and frame attributes used by the
+exception formatters, so they can be formatted like the original.
+"""
+
+import traceback
+from collections import namedtuple
+
+from zExceptions import ExceptionFormatter
+from zExceptions.ExceptionFormatter import TextExceptionFormatter
+from zExceptions.ExceptionFormatter import _str
+
+
+# Frame globals and locals used by the exception formatters.
+_GLOBAL_NAMES = ('__name__', '__revision__', '__version__',
+                 '__traceback_supplement__')
+_LOCAL_NAMES = ('__traceback_supplement__', '__exception_formatter__')
+
+
+class FrameCopy:
+
+    __slots__ = ('f_code', 'f_globals', 'f_locals')
+
+    def __init__(self, f_code, f_globals, f_locals):
+        self.f_code = f_code
+        self.f_globals = f_globals
+        self.f_locals = f_locals
+
+
+class TracebackCopy:
+
+    __slots__ = ('tb_frame', 'tb_lineno', 'tb_next')
+
+    def __init__(self, tb_frame, tb_lineno, tb_next=None):
+        self.tb_frame = tb_frame
+        self.tb_lineno = tb_lineno
+        self.tb_next = tb_next
+
+
+def _linkTraceback(frames):
+    """Return a chain of traceback copies for (frame, line number) pairs."""
+    first = last = None
+    for frame, lineno in frames:
+        copy = TracebackCopy(frame, lineno)
+        if last is None:
+            first = copy
+        else:
+            last.tb_next = copy
+        last = copy
+    return first
+
+
+def _iterFrameCopies(tb):
+    while tb is not None:
+        f = tb.tb_frame
+        f_globals = f.f_globals
+        f_locals = f.f_locals
+        copied_globals = {name: f_globals[name]
+                          for name in _GLOBAL_NAMES if name in f_globals}
+        copied_locals = {name: f_locals[name]
+                         for name in _LOCAL_NAMES if name in f_locals}
+        try:
+            tbi = f_locals.get('__traceback_info__', None)
+            if tbi is not None:
+                copied_locals['__traceback_info__'] = str(tbi)
+        except:  # noqa: E722 do not use bare 'except'
+            pass
+        yield (FrameCopy(f.f_code, copied_globals, copied_locals),
+               tb.tb_lineno)
+        tb = tb.tb_next
+
+
+def copyTraceback(tb):
+    """Return a copy of the traceback chain `tb`.
+
+    Only the module globals and locals needed for formatting are copied.
+    Supplements are not evaluated, ``__traceback_info__`` is converted to a
+    string right away.
+    """
+    return _linkTraceback(_iterFrameCopies(tb))
+
+
+# Stands in for the code object of a frame in a snapshot.  Equal for equal
+# names, so the line cache of the formatters works across snapshots.
+_Code = namedtuple('_Code', ('co_filename', 'co_name'))
+
+
+class _Repr(str):
+    """A string which is its own repr."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return str(self)
+
+
+class SupplementCopy:
+    """Traceback supplement built from the fields of a snapshot."""
+
+    def __init__(self, object_repr, source_url, line, column, expression,
+                 warnings, info, html_info):
+        self.object = None if object_repr is None else _Repr(object_repr)
+        self.source_url = source_url
+        self.line = line
+        self.column = column
+        self.expression = expression
+        self.warnings = warnings
+        self._info = info
+        self._html_info = html_info
+
+    def getInfo(self, as_html=0):
+        return self._html_info if as_html else self._info
+
+
+class _FrameLookup(TextExceptionFormatter):
+    # Looks up the supplement and revision of frames like the formatters.
+    show_revisions = 1
+
+
+_lookup = _FrameLookup()
+
+
+def _getInfo(supplement, *args):
+    getInfo = getattr(supplement, 'getInfo', None)
+    if getInfo is None:
+        return None
+    try:
+        return _str(getInfo(*args))
+    except:  # noqa: E722 do not use bare 'except'
+        return None
+
+
+def _captureSupplement(tbs, lineno):
+    try:
+        supplement = tbs[0](*tbs[1:])
+        object = getattr(supplement, 'object', None)
+        line = getattr(supplement, 'line', 0)
+        if line == -1:
+            line = lineno
+        warnings = getattr(supplement, 'warnings', None)
+        return (
+            None if object is None else repr(object),
+            _str(getattr(supplement, 'source_url', None)),
+            line,
+            getattr(supplement, 'column', -1),
+            _str(getattr(supplement, 'expression', None)),
+            tuple(str(w) for w in warnings) if warnings else None,
+            _getInfo(supplement),
+            _getInfo(supplement, 1),
+        )
+    except:  # noqa: E722 do not use bare 'except'
+        if ExceptionFormatter.DEBUG_EXCEPTION_FORMATTER:
+            traceback.print_exc()
+        return None
+
+
+class TracebackSnapshot:
+    """A compact, picklable record of an exception and its traceback.
+
+    `frames` is a tuple with a (module name, line number, function name,
+    file name, revision, supplement, traceback info, formatting) tuple per
+    frame.  The supplement is evaluated when the snapshot is taken and kept
+    as a tuple of its fields.  Everything is stored as strings, numbers and
+    tuples, so the snapshot does not keep any frame or object alive.
+    """
+
+    __slots__ = ('exc_type', 'exc_lines', 'frames')
+
+    def __init__(self, exc_type, exc_lines, frames):
+        self.exc_type = exc_type
+        self.exc_lines = exc_lines
+        self.frames = frames
+
+    @classmethod
+    def capture(cls, etype, value, tb):
+        frames = []
+        while tb is not None:
+            f = tb.tb_frame
+            co = f.f_code
+            f_globals = f.f_globals
+            f_locals = f.f_locals
+            lineno = tb.tb_lineno
+            revision = _lookup.getRevision(f_globals)
+            tbs = _lookup.getSupplement(f_locals, f_globals)
+            supplement = None
+            if tbs is not None:
+                supplement = _captureSupplement(tbs, lineno)
+            try:
+                tbi = _str(f_locals.get('__traceback_info__', None))
+            except:  # noqa: E722 do not use bare 'except'
+                tbi = None
+            frames.append((
+                f_globals.get('__name__', co.co_filename), lineno,
+                co.co_name, co.co_filename, revision, supplement, tbi,
+                bool(f_locals.get('__exception_formatter__')),
+            ))
+            tb = tb.tb_next
+        return cls(f'{etype.__module__}.{etype.__qualname__}',
+                   tuple(traceback.format_exception_only(etype, value)),
+                   tuple(frames))
+
+    def traceback(self):
+        """Return a traceback copy the exception formatters can format."""
+        return _linkTraceback(self._iterFrameCopies())
+
+    def _iterFrameCopies(self):
+        for (modname, lineno, name, filename, revision, supplement, tbi,
+             formatting) in self.frames:
+            f_globals = {'__name__': modname}
+            if revision is not None:
+                f_globals['__revision__'] = revision
+            f_locals = {}
+            if supplement is not None:
+                f_locals['__traceback_supplement__'] = (
+                    SupplementCopy,) + supplement
+            if tbi is not None:
+                f_locals['__traceback_info__'] = tbi
+            if formatting:
+                f_locals['__exception_formatter__'] = 1
+            yield FrameCopy(_Code(filename, name), f_globals, f_locals), lineno
+
+    def __reduce__(self):
+        return (self.__class__, (self.exc_type, self.exc_lines, self.frames))
+
+    def __eq__(self, other):
+        if not isinstance(other, TracebackSnapshot):
+            return NotImplemented
+        return self.__reduce__()[1] == other.__reduce__()[1]
+
+    def __hash__(self):
+        return hash(self.__reduce__()[1])
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} {self.exc_type} '
+                f'({len(self.frames)} frames)>')
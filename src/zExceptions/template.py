@@ -0,0 +1,100 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Precompiled ``str.format`` style templates for error bodies.
+
+A template is parsed once into literal pieces and slots, rendering only
+fills in the slots and joins the pieces.  Besides the standard ``!s``,
+``!r`` and ``!a`` conversions, ``!h`` HTML-escapes a slot.
+"""
+
+from html import escape
+from string import Formatter
+
+from zExceptions.cache import LRUCache
+
+
+_conversions = {
+    's': str,
+    'r': repr,
+    'a': ascii,
+    'h': lambda value: escape(str(value)),
+}
+
+
+class CompiledTemplate:
+    """A template compiled from a format string.
+
+    Only the keyword fields listed in `fields` are allowed.  Any other
+    field raises a ValueError when compiling, instead of a KeyError when
+    rendering.
+    """
+
+    __slots__ = ('source', '_pieces', '_slots')
+
+    def __init__(self, source, fields=('title', 'detail')):
+        self.source = source
+        pieces = []
+        slots = []
+        try:
+            parsed = list(Formatter().parse(source))
+        except ValueError as e:
+            raise ValueError(f'Invalid template: {e}') from None
+        for literal, name, spec, conversion in parsed:
+            if literal:
+                pieces.append(literal)
+            if name is None:
+                continue
+            if name not in fields:
+                raise ValueError(
+                    f'Unknown template field {name!r}, expected one of '
+                    f'{", ".join(fields)}')
+            if conversion is not None and conversion not in _conversions:
+                raise ValueError(
+                    f'Unknown conversion {conversion!r} for field {name!r}')
+            if '{' in spec:
+                raise ValueError(
+                    f'Nested fields are not supported in field {name!r}')
+            slots.append((len(pieces), name,
+                          _conversions.get(conversion), spec or None))
+            pieces.append(None)
+        self._pieces = pieces
+        self._slots = tuple(slots)
+
+    def render(self, **values):
+        parts = self._pieces[:]
+        for index, name, convert, spec in self._slots:
+            value = values[name]
+            if convert is not None:
+                value = convert(value)
+            if spec is not None:
+                value = format(value, spec)
+            elif type(value) is not str:
+                value = format(value)
+            parts[index] = value
+        return ''.join(parts)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.source[:30]!r}>'
+
+
+_compiled = LRUCache(64)
+
+
+def compileTemplate(source):
+    """Return the compiled template for `source`, compiling it once."""
+    template = _compiled.get(source)
+    if template is None:
+        template = CompiledTemplate(source)
+        _compiled.set(source, template)
+    return template
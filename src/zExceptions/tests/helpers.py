@@ -0,0 +1,42 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Helpers shared by the traceback tests.
+"""
+
+import sys
+
+
+class Marker:
+
+    def __repr__(self):
+        return '<Marker>'
+
+
+def fail(message='Foo', info=None, supplement=None, obj=None):
+    """Raise ValueError with traceback info and a supplement.
+
+    `obj` is kept alive by the raising frame.
+    """
+    __traceback_info__ = info  # noqa: F841
+    if supplement is not None:
+        __traceback_supplement__ = supplement  # noqa: F841
+    raise ValueError(message)
+
+
+def excInfo(**kw):
+    """Return the exception info of a `fail` call."""
+    try:
+        fail(**kw)
+    except ValueError:
+        return sys.exc_info()
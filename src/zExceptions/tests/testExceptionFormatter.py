@@ -16,6 +16,7 @@ ExceptionFormatter tests.
 """
 
 import sys
+import time
 from unittest import TestCase
 
 from zExceptions import HTTPException
@@ -133,3 +134,581 @@ class Test(TestCase):
             self.fail('no exception occurred')
         self.assertIn('&lt;', string)
         self.assertIn('&gt;', string)
+
+    def testLineCache(self):
+        from zExceptions.ExceptionFormatter import line_cache
+        line_cache.clear()
+        try:
+            raise ExceptionForTesting()
+        except ExceptionForTesting:
+            first = tb()
+            self.assertEqual(line_cache.stats()['misses'], 1)
+            second = tb()
+            self.assertEqual(line_cache.stats()['hits'], 1)
+            html = tb(1)
+            self.assertEqual(line_cache.stats()['misses'], 2)
+        self.assertEqual(first, second)
+        self.assertIn('testLineCache', html)
+
+    def testLineCacheTracebackInfo(self):
+        # The traceback info is not cached.
+        def f(n):
+            __traceback_info__ = 'level%d' % n
+            raise ExceptionForTesting
+
+        for n in range(2):
+            try:
+                f(n)
+            except ExceptionForTesting:
+                self.assertIn('level%d' % n, tb())
+
+
+class DeduplicationTests(TestCase):
+
+    def setUp(self):
+        from zExceptions.ExceptionFormatter import deduplicator
+        deduplicator.seen.clear()
+
+    tearDown = setUp
+
+    def _raise(self, value):
+        raise ExceptionForTesting(value)
+
+    def _format(self, value, as_html=0):
+        try:
+            self._raise(value)
+        except ExceptionForTesting:
+            t, v, b = sys.exc_info()
+            try:
+                return format_exception(t, v, b, as_html=as_html, dedupe=True)
+            finally:
+                del b
+
+    def testFingerprint(self):
+        from zExceptions.ExceptionFormatter import fingerprint
+
+        def fp(value):
+            try:
+                self._raise(value)
+            except ExceptionForTesting:
+                t, v, b = sys.exc_info()
+                return fingerprint(t, b)
+
+        self.assertEqual(fp('one'), fp('two'))
+        self.assertEqual(fp('one')[0], ExceptionForTesting)
+        self.assertEqual(len(fp('one')[1]), 2)
+
+    def testRepeated(self):
+        first = self._format('one')
+        second = self._format('two')
+        self.assertIn('_raise', ''.join(first))
+        self.assertNotIn('_raise', ''.join(second))
+        self.assertIn('ExceptionForTesting: two', second[-1])
+        ref = first[1].split()[-1].rstrip(')')
+        self.assertEqual(first[1], '  (Traceback %s)\n' % ref)
+        self.assertEqual(second[1],
+                         '  (Same as traceback %s, seen 2 times)\n' % ref)
+        self.assertIn('seen 3 times', self._format('three')[1])
+
+    def testRepeatedHTML(self):
+        first = self._format('one', as_html=1)
+        second = self._format('two', as_html=1)
+        self.assertTrue(first[1].startswith('<li>  (Traceback '))
+        self.assertTrue(second[1].startswith('<li>  (Same as traceback '))
+        self.assertTrue(second[-1].startswith('</ul>'))
+        # Text and HTML formatting are tracked separately.
+        self.assertTrue(self._format('one')[1].startswith('  (Traceback '))
+
+    def testDifferentLocation(self):
+        self._format('one')
+        try:
+            raise ExceptionForTesting('two')
+        except ExceptionForTesting:
+            t, v, b = sys.exc_info()
+            result = format_exception(t, v, b, dedupe=True)
+            del b
+        self.assertIn('testDifferentLocation', ''.join(result))
+
+    def testInterval(self):
+        from zExceptions.ExceptionFormatter import deduplicator
+        deduplicator.interval = 0
+        try:
+            self._format('one')
+            self.assertIn('_raise', ''.join(self._format('two')))
+        finally:
+            deduplicator.interval = 300
+
+
+class IterFormatExceptionTests(TestCase):
+
+    def _raiseNested(self, n):
+        __traceback_info__ = 'level%d' % n
+        if n > 0:
+            self._raiseNested(n - 1)
+        else:
+            raise ExceptionForTesting('innermost')
+
+    def _excInfo(self, n=10):
+        try:
+            self._raiseNested(n)
+        except ExceptionForTesting:
+            return sys.exc_info()
+
+    def testSameAsFormatException(self):
+        from zExceptions.ExceptionFormatter import iter_format_exception
+        t, v, b = self._excInfo()
+        self.assertEqual(list(iter_format_exception(t, v, b)),
+                         format_exception(t, v, b))
+        self.assertEqual(list(iter_format_exception(t, v, b, as_html=1)),
+                         format_exception(t, v, b, as_html=1))
+
+    def testLazy(self):
+        from zExceptions.ExceptionFormatter import TextExceptionFormatter
+        formatted = []
+
+        class Formatter(TextExceptionFormatter):
+            def formatLine(self, tb):
+                formatted.append(tb)
+                return TextExceptionFormatter.formatLine(self, tb)
+
+        t, v, b = self._excInfo()
+        lines = Formatter().iterFormatException(t, v, b)
+        self.assertEqual(next(lines), 'Traceback (innermost last):\n')
+        self.assertEqual(formatted, [])
+        next(lines)
+        next(lines)
+        self.assertEqual(len(formatted), 2)
+        lines.close()
+
+    def testHeadAndTail(self):
+        from zExceptions.ExceptionFormatter import TextExceptionFormatter
+        formatted = []
+
+        class Formatter(TextExceptionFormatter):
+            def formatLine(self, tb):
+                formatted.append(tb)
+                return TextExceptionFormatter.formatLine(self, tb)
+
+        t, v, b = self._excInfo()
+        lines = list(Formatter().iterFormatException(
+            t, v, b, limit=3, tail=2))
+        # The prefix, _excInfo, two levels, the omitted count, two levels
+        # and the exception.
+        self.assertEqual(len(lines), 8)
+        self.assertEqual(len(formatted), 5)
+        self.assertIn('level10', lines[2])
+        self.assertIn('level9', lines[3])
+        self.assertEqual(lines[4], '  (7 frames omitted)\n')
+        self.assertIn('level1', lines[5])
+        self.assertIn('level0', lines[6])
+        self.assertIn('innermost', lines[-1])
+
+    def testTailWithoutOmitted(self):
+        from zExceptions.ExceptionFormatter import iter_format_exception
+        t, v, b = self._excInfo(2)
+        lines = list(iter_format_exception(t, v, b, limit=2, tail=5))
+        self.assertEqual(len(lines), 6)
+        self.assertNotIn('omitted', ''.join(lines))
+
+    def testTailHTML(self):
+        from zExceptions.ExceptionFormatter import iter_format_exception
+        t, v, b = self._excInfo()
+        lines = list(iter_format_exception(
+            t, v, b, limit=1, tail=1, as_html=1))
+        self.assertEqual(lines[2], '<li>  (10 frames omitted)</li>\n')
+
+
+class CollapseRepeatsTests(TestCase):
+
+    def _callFUT(self, keys, min_repeats=3, max_period=4):
+        from zExceptions.ExceptionFormatter import collapseRepeats
+        return collapseRepeats(keys, min_repeats, max_period)
+
+    def testNoRepeats(self):
+        self.assertEqual(self._callFUT('abcdef'), [0, 1, 2, 3, 4, 5])
+
+    def testShortRunKept(self):
+        self.assertEqual(self._callFUT('abbc'), [0, 1, 2, 3])
+
+    def testSingleFrameRun(self):
+        self.assertEqual(self._callFUT('abbbbbc'), [0, 1, (1, 4), 6])
+
+    def testCycle(self):
+        self.assertEqual(self._callFUT('xabababab'), [0, 1, 2, (2, 3)])
+
+    def testCycleTooLong(self):
+        self.assertEqual(self._callFUT('abcde' * 3, max_period=4),
+                         list(range(15)))
+
+    def testMinRepeatsOne(self):
+        self.assertEqual(self._callFUT('abbc', min_repeats=1),
+                         [0, 1, (1, 1), 3])
+
+
+class ElideRepeatsTests(TestCase):
+
+    def _recurse(self, n):
+        if n > 0:
+            self._recurse(n - 1)
+        else:
+            raise ExceptionForTesting('innermost')
+
+    def _ping(self, n):
+        self._pong(n)
+
+    def _pong(self, n):
+        if n > 0:
+            self._ping(n - 1)
+        else:
+            raise ExceptionForTesting('innermost')
+
+    def _format(self, func, n, **kw):
+        from zExceptions.ExceptionFormatter import TextExceptionFormatter
+        try:
+            func(n)
+        except ExceptionForTesting:
+            t, v, b = sys.exc_info()
+            try:
+                return TextExceptionFormatter(**kw).formatException(t, v, b)
+            finally:
+                del b
+
+    def testRecursion(self):
+        lines = self._format(self._recurse, 100)
+        # The prefix, _format, the first _recurse frame, the marker, the
+        # innermost frame and the exception.
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(lines[3], '  [previous frame repeated 99 times]\n')
+        self.assertIn('innermost', lines[-1])
+
+    def testMutualRecursion(self):
+        lines = self._format(self._ping, 50)
+        self.assertEqual(
+            lines[4], '  [previous 2 frames repeated 49 times]\n')
+        self.assertIn('_pong', lines[-2])
+
+    def testRecursionWithLimit(self):
+        # The innermost frames are not cut off by the limit.
+        lines = self._format(self._recurse, 300, limit=4)
+        self.assertEqual(len(lines), 6)
+        self.assertIn('_recurse', lines[-2])
+        lines = self._format(self._recurse, 300, limit=2, tail=1)
+        self.assertEqual(lines[3], '  (299 frames omitted)\n')
+        self.assertIn('_recurse', lines[-2])
+
+    def testDisabled(self):
+        from zExceptions.ExceptionFormatter import TextExceptionFormatter
+
+        class Formatter(TextExceptionFormatter):
+            elide_repeats = False
+
+        try:
+            self._recurse(30)
+        except ExceptionForTesting:
+            t, v, b = sys.exc_info()
+            lines = Formatter().formatException(t, v, b)
+            del b
+        self.assertEqual(len(lines), 34)
+
+    def testHTML(self):
+        try:
+            self._recurse(30)
+        except ExceptionForTesting:
+            t, v, b = sys.exc_info()
+            lines = format_exception(t, v, b, as_html=1)
+            del b
+        self.assertEqual(
+            lines[3], '<li>  [previous frame repeated 29 times]</li>\n')
+
+    def testDefaultTail(self):
+        from zExceptions.ExceptionFormatter import TextExceptionFormatter
+
+        class Formatter(TextExceptionFormatter):
+            elide_repeats = False
+
+        try:
+            self._recurse(300)
+        except ExceptionForTesting:
+            t, v, b = sys.exc_info()
+            lines = Formatter(200, 20).formatException(t, v, b)
+            del b
+        self.assertEqual(len(lines), 223)
+        self.assertEqual(lines[201], '  (82 frames omitted)\n')
+
+
+class SlowSupplement:
+
+    delay = 0.02
+    calls = 0
+
+    def __init__(self, expression):
+        SlowSupplement.calls += 1
+        time.sleep(self.delay)
+        self.expression = expression
+
+
+class SlowInfoSupplement:
+
+    delay = 0.02
+    calls = 0
+
+    def __init__(self, expression):
+        self.expression = expression
+
+    def getInfo(self, as_html=0):
+        SlowInfoSupplement.calls += 1
+        time.sleep(self.delay)
+        return 'Slow info'
+
+
+class SupplementBudgetTests(TestCase):
+
+    def setUp(self):
+        SlowSupplement.calls = 0
+
+    def _raiseSlow(self):
+        __traceback_supplement__ = (SlowSupplement, 'outer')  # noqa: F841
+        self._raiseSlowInner()
+
+    def _raiseSlowInner(self):
+        __traceback_supplement__ = (SlowSupplement, 'inner')  # noqa: F841
+        raise ExceptionForTesting('slow')
+
+    def _format(self, **kw):
+        from zExceptions.ExceptionFormatter import TextExceptionFormatter
+        try:
+            self._raiseSlow()
+        except ExceptionForTesting:
+            t, v, b = sys.exc_info()
+            try:
+                return ''.join(
+                    TextExceptionFormatter(**kw).formatException(t, v, b))
+            finally:
+                del b
+
+    def testNoBudget(self):
+        string = self._format()
+        self.assertIn('Expression: outer', string)
+        self.assertIn('Expression: inner', string)
+        self.assertNotIn('time budget exceeded', string)
+
+    def testFrameBudget(self):
+        string = self._format(frame_budget=0.001)
+        self.assertEqual(SlowSupplement.calls, 2)
+        self.assertNotIn('Expression', string)
+        self.assertEqual(string.count(
+            '   - Supplement skipped, time budget exceeded'), 2)
+
+    def testFrameBudgetNotExceeded(self):
+        string = self._format(frame_budget=10)
+        self.assertIn('Expression: outer', string)
+        self.assertIn('Expression: inner', string)
+
+    def testTracebackBudget(self):
+        string = self._format(traceback_budget=0.001)
+        # The inner supplement is not evaluated at all.
+        self.assertEqual(SlowSupplement.calls, 1)
+        self.assertNotIn('Expression', string)
+        self.assertEqual(string.count(
+            '   - Supplement skipped, time budget exceeded'), 2)
+
+    def testTimings(self):
+        from zExceptions.ExceptionFormatter import SupplementTimings
+        timings = SupplementTimings()
+        self._format(timings=timings)
+        stats = timings.stats()
+        name = __name__ + '.SlowSupplement'
+        self.assertEqual(list(stats), [name])
+        self.assertEqual(stats[name]['count'], 2)
+        self.assertGreaterEqual(stats[name]['max'], SlowSupplement.delay)
+        self.assertGreaterEqual(stats[name]['total'], stats[name]['max'])
+        timings.clear()
+        self.assertEqual(timings.stats(), {})
+
+    def testDefaultTimings(self):
+        from zExceptions.ExceptionFormatter import supplement_timings
+        supplement_timings.clear()
+        try:
+            self._raiseSlow()
+        except ExceptionForTesting:
+            format_exception(*sys.exc_info())
+        self.assertIn(__name__ + '.SlowSupplement', supplement_timings.stats())
+        supplement_timings.clear()
+
+
+class StructuredExceptionFormatterTests(TestCase):
+
+    def _raise(self):
+        __traceback_info__ = 'Adam & Eve'  # noqa: F841
+        __traceback_supplement__ = (  # noqa: F841
+            TestingTracebackSupplement, 'You are one in a million')
+        raise ExceptionForTesting('structured')
+
+    def _recurse(self, n):
+        if n > 0:
+            self._recurse(n - 1)
+        else:
+            raise ExceptionForTesting('innermost')
+
+    def _format(self, func, *args, **kw):
+        from zExceptions.ExceptionFormatter import format_exception_structured
+        try:
+            func(*args)
+        except ExceptionForTesting:
+            t, v, b = sys.exc_info()
+            try:
+                return format_exception_structured(t, v, b, **kw)
+            finally:
+                del b
+
+    def testFrames(self):
+        result = self._format(self._raise)
+        self.assertEqual(result['type'], __name__ + '.ExceptionForTesting')
+        self.assertEqual(result['exception'],
+                         __name__ + '.ExceptionForTesting: structured')
+        self.assertEqual(len(result['frames']), 2)
+        frame = result['frames'][-1]
+        self.assertEqual(frame['module'], __name__)
+        self.assertEqual(frame['function'], '_raise')
+        self.assertEqual(frame['filename'], __file__)
+        self.assertIsInstance(frame['line'], int)
+        self.assertEqual(frame['traceback_info'], 'Adam & Eve')
+        self.assertEqual(frame['supplement'], {
+            'object': None,
+            'url': '/somepath',
+            'line': 634,
+            'column': 57,
+            'expression': 'You are one in a million',
+            'warnings': ['Repent, for the end is nigh'],
+            'extra': None,
+        })
+        self.assertNotIn('supplement', result['frames'][0])
+        self.assertNotIn('traceback_info', result['frames'][0])
+
+    def testJSON(self):
+        import json
+        result = self._format(self._raise)
+        self.assertEqual(json.loads(json.dumps(result)), result)
+
+    def testRepeatsAndOmitted(self):
+        from zExceptions.ExceptionFormatter import StructuredExceptionFormatter
+        frames = self._format(self._recurse, 100)['frames']
+        self.assertEqual(frames[2], {'repeated': 99, 'period': 1})
+        self.assertEqual(len(frames), 4)
+        try:
+            self._recurse(5)
+        except ExceptionForTesting:
+            t, v, b = sys.exc_info()
+            frames = StructuredExceptionFormatter(2, 1).formatFrames(b)
+            del b
+        self.assertEqual(frames[2], {'omitted': 4})
+        self.assertEqual(frames[3]['function'], '_recurse')
+
+    def testIterFormatException(self):
+        from zExceptions.ExceptionFormatter import structured_formatter
+        try:
+            self._raise()
+        except ExceptionForTesting:
+            t, v, b = sys.exc_info()
+            expected = structured_formatter.formatException(t, v, b)
+            result = list(structured_formatter.iterFormatException(t, v, b))
+            del b
+        self.assertEqual(result[:-1], expected.pop('frames'))
+        self.assertEqual(result[-1], expected)
+
+    def testDeduplicated(self):
+        from zExceptions.ExceptionFormatter import TracebackDeduplicator
+        from zExceptions.ExceptionFormatter import structured_formatter
+        deduplicator = TracebackDeduplicator()
+        results = []
+        for i in range(2):
+            try:
+                self._raise()
+            except ExceptionForTesting:
+                t, v, b = sys.exc_info()
+                results.append(deduplicator.formatException(
+                    structured_formatter, t, v, b))
+                del b
+        first, second = results
+        self.assertEqual(len(first['frames']), 2)
+        self.assertEqual(first['count'], 1)
+        self.assertEqual(second, {
+            'type': first['type'],
+            'exception': first['exception'],
+            'reference': first['reference'],
+            'count': 2,
+        })
+
+    def testSnapshot(self):
+        from zExceptions.ExceptionFormatter import structured_formatter
+        from zExceptions.snapshot import TracebackSnapshot
+        try:
+            self._raise()
+        except ExceptionForTesting:
+            t, v, b = sys.exc_info()
+            expected = structured_formatter.formatException(t, v, b)
+            snapshot = TracebackSnapshot.capture(t, v, b)
+            del b
+        self.assertEqual(structured_formatter.formatSnapshot(snapshot),
+                         expected)
+
+
+class GetInfoBudgetTests(TestCase):
+
+    def setUp(self):
+        SlowInfoSupplement.calls = 0
+
+    def _raiseSlow(self):
+        __traceback_supplement__ = (  # noqa: F841
+            SlowInfoSupplement, 'outer')
+        self._raiseSlowInner()
+
+    def _raiseSlowInner(self):
+        __traceback_supplement__ = (  # noqa: F841
+            SlowInfoSupplement, 'inner')
+        raise ExceptionForTesting('slow')
+
+    def _format(self, formatter):
+        try:
+            self._raiseSlow()
+        except ExceptionForTesting:
+            t, v, b = sys.exc_info()
+            try:
+                return formatter.formatException(t, v, b)
+            finally:
+                del b
+
+    def testNoBudget(self):
+        from zExceptions.ExceptionFormatter import TextExceptionFormatter
+        string = ''.join(self._format(TextExceptionFormatter()))
+        self.assertEqual(string.count('Slow info'), 2)
+
+    def testFrameBudget(self):
+        from zExceptions.ExceptionFormatter import TextExceptionFormatter
+        string = ''.join(self._format(
+            TextExceptionFormatter(frame_budget=0.001)))
+        self.assertEqual(SlowInfoSupplement.calls, 2)
+        self.assertNotIn('Slow info', string)
+        # The fast part of the supplement is kept.
+        self.assertIn('Expression: outer', string)
+        self.assertIn('Expression: inner', string)
+        self.assertEqual(string.count(
+            '   - Supplement skipped, time budget exceeded'), 2)
+
+    def testTracebackBudget(self):
+        from zExceptions.ExceptionFormatter import TextExceptionFormatter
+        string = ''.join(self._format(
+            TextExceptionFormatter(traceback_budget=0.001)))
+        # getInfo() of the inner supplement is not called at all.
+        self.assertEqual(SlowInfoSupplement.calls, 1)
+        self.assertNotIn('Slow info', string)
+        self.assertEqual(string.count(
+            '   - Supplement skipped, time budget exceeded'), 2)
+
+    def testStructured(self):
+        from zExceptions.ExceptionFormatter import StructuredExceptionFormatter
+        result = self._format(StructuredExceptionFormatter(frame_budget=0.001))
+        supplement = result['frames'][-1]['supplement']
+        self.assertIsNone(supplement['extra'])
+        self.assertEqual(supplement['expression'], 'inner')
+        self.assertEqual(supplement['skipped'], 'time budget exceeded')
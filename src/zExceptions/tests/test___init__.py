@@ -1,3 +1,4 @@
+import asyncio
 import json
 import unittest
 
@@ -25,6 +26,71 @@ class TestHTTPException(unittest.TestCase):
         exc.setHeader('Location', url)
         self.assertEqual(exc.headers, {'Location': url})
 
+    def test_headers_in_dict(self):
+        from zExceptions.headers import HTTPHeaders
+        exc = self._makeOne()
+        exc.setHeader('Location', '/foo')
+        self.assertEqual(list(vars(exc)), ['headers'])
+        self.assertIsInstance(vars(exc)['headers'], HTTPHeaders)
+
+    def test_headers_case_insensitive(self):
+        exc = self._makeOne()
+        exc.setHeader('Content-Type', 'text/plain')
+        exc.setHeader('content-type', 'application/json')
+        self.assertEqual(exc.getHeader('CONTENT-TYPE'), 'application/json')
+        self.assertEqual(len(exc.headers), 1)
+
+    def test_headers_multiple_values(self):
+        exc = self._makeOne()
+        exc.addHeader('Set-Cookie', 'a=1')
+        exc.addHeader('Set-Cookie', 'b=2')
+        self.assertEqual(exc.headers.getAll('set-cookie'), ['a=1', 'b=2'])
+        exc.removeHeader('set-cookie')
+        self.assertIsNone(exc.getHeader('Set-Cookie'))
+
+    def test_headers_missing(self):
+        exc = self._makeOne()
+        self.assertEqual(exc.getHeader('Location', 'default'), 'default')
+        exc.removeHeader('Location')
+        self.assertIsNone(getattr(exc, 'headers', None))
+
+    def test_headers_plain_dict(self):
+        exc = self._makeOne()
+        exc.headers = {'Location': '/foo'}
+        exc.setHeader('X-Foo', 'bar')
+        self.assertEqual(exc.getHeader('location'), '/foo')
+        self.assertEqual(exc.headers.items(),
+                         [('Location', '/foo'), ('X-Foo', 'bar')])
+
+    def test_pickle(self):
+        import pickle
+
+        from zExceptions import NotFound
+        exc = NotFound('x')
+        exc.setHeader('X-Foo', '1')
+        exc.detail = 'Some detail'
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copy = pickle.loads(pickle.dumps(exc, protocol))
+            self.assertIs(copy.__class__, NotFound)
+            self.assertEqual(copy.args, ('x',))
+            self.assertEqual(copy.headers.items(), [('X-Foo', '1')])
+            self.assertEqual(copy.detail, 'Some detail')
+
+    def test_pickle_without_headers(self):
+        import pickle
+        exc = pickle.loads(pickle.dumps(self._makeOne('x')))
+        self.assertEqual(exc.args, ('x',))
+        self.assertIsNone(getattr(exc, 'headers', None))
+
+    def test_copy(self):
+        import copy
+        exc = self._makeOne('x')
+        exc.setHeader('X-Foo', '1')
+        exc.setStatus(404)
+        clone = copy.copy(exc)
+        self.assertEqual(clone.getHeader('X-Foo'), '1')
+        self.assertEqual(clone.getStatus(), 404)
+
     def test_status(self):
         exc = self._makeOne()
         self.assertEqual(exc.getStatus(), 500)
@@ -40,12 +106,13 @@ class TestHTTPException(unittest.TestCase):
         def start_response(status, headers):
             called.append((status, headers))
 
-        response = exc({'Foo': 1}, start_response)
+        response = b''.join(exc({'Foo': 1}, start_response))
         self.assertEqual(called, [(
             '500 Internal Server Error',
-            [('content-type', 'text/html;charset=utf-8')]
+            [('content-type', 'text/html;charset=utf-8'),
+             ('vary', 'Accept'),
+             ('content-length', str(len(response)))]
         )])
-        response = b''.join(response)
         self.assertTrue(response.startswith(b'<!DOCTYPE html>'))
         self.assertIn(b'Sorry, a site error occurred.', response)
         self.assertIn(b'Foo Error', response)
@@ -63,7 +130,8 @@ class TestHTTPException(unittest.TestCase):
         response = exc({'Foo': 1}, start_response)
         self.assertEqual(called, [(
             '503 Service Unavailable',
-            [('content-type', 'text/html;charset=utf-8')]
+            [('content-type', 'text/html;charset=utf-8'),
+             ('content-length', '16')]
         )])
         self.assertEqual(response, [b'<html>Foo</html>'])
 
@@ -78,16 +146,99 @@ class TestHTTPException(unittest.TestCase):
         def start_response(status, headers):
             called.append((status, headers))
 
-        response = exc({'Foo': 1}, start_response)
+        response = b''.join(exc({'Foo': 1}, start_response))
         self.assertEqual(called, [(
             '503 Service Unavailable',
-            [('content-type', 'text/html;charset=utf-8')]
+            [('content-type', 'text/html;charset=utf-8'),
+             ('vary', 'Accept'),
+             ('content-length', str(len(response)))]
         )])
-        response = b''.join(response)
         self.assertTrue(response.startswith(b'<!DOCTYPE html>'))
         self.assertIn(b'<p><strong>Foo</strong></p>', response)
         self.assertIn(b'<p>Some foo is going on.</p>', response)
 
+    def test_call_iterable_body(self):
+        consumed = []
+
+        def report():
+            for chunk in ('<ul>', b'<li>first</li>', '<li>\u03A9</li>',
+                          '</ul>'):
+                consumed.append(chunk)
+                yield chunk
+
+        exc = self._makeOne()
+        exc.setStatus(422)
+        exc.setBody(report())
+
+        called = []
+
+        def start_response(status, headers):
+            called.append((status, headers))
+
+        response = exc({}, start_response)
+        self.assertEqual(called, [(
+            '422 Unprocessable Entity',
+            [('content-type', 'text/html;charset=utf-8')]
+        )])
+        self.assertEqual(consumed, [])
+        chunks = iter(response)
+        self.assertEqual(next(chunks), b'<ul>')
+        self.assertEqual(consumed, ['<ul>'])
+        self.assertEqual(list(chunks), [
+            b'<li>first</li>', '<li>\u03A9</li>'.encode(), b'</ul>'])
+
+    def test_call_iterable_body_close(self):
+        closed = []
+
+        class Body(list):
+            def close(self):
+                closed.append(True)
+
+        exc = self._makeOne()
+        exc.setBody(Body(['Foo']))
+        response = exc({}, lambda status, headers: None)
+        self.assertEqual(list(response), [b'Foo'])
+        response.close()
+        self.assertEqual(closed, [True])
+
+        exc.setBody(['Foo'])
+        exc({}, lambda status, headers: None).close()
+
+    def test_call_bytes_body(self):
+        exc = self._makeOne()
+        exc.setBody(b'\xce\xa9')
+
+        called = []
+
+        def start_response(status, headers):
+            called.append((status, headers))
+
+        response = exc({}, start_response)
+        self.assertEqual(response, [b'\xce\xa9'])
+        self.assertEqual(called[0][1][-1], ('content-length', '2'))
+
+    def test_call_bytearray_body(self):
+        exc = self._makeOne()
+        exc.setBody(bytearray(b'Foo'))
+        response = exc({}, lambda status, headers: None)
+        self.assertEqual(response, [b'Foo'])
+        self.assertIs(type(response[0]), bytes)
+
+    def test_call_explicit_content_length(self):
+        exc = self._makeOne()
+        exc.setHeader('Content-Length', '3')
+        exc.setBody(b'Foo')
+
+        called = []
+
+        def start_response(status, headers):
+            called.append((status, headers))
+
+        exc({}, start_response)
+        self.assertEqual(called[0][1], [
+            ('Content-Length', '3'),
+            ('content-type', 'text/html;charset=utf-8')])
+
     def test_call_empty_body(self):
         exc = self._makeOne()
         exc.empty_body = True
@@ -116,13 +267,14 @@ class TestHTTPException(unittest.TestCase):
         def start_response(status, headers):
             called.append((status, headers))
 
-        response = exc({'Foo': 1}, start_response)
+        response = b''.join(exc({'Foo': 1}, start_response))
         self.assertEqual(called, [(
             '302 Found',
             [('Location', url),
-             ('content-type', 'text/html;charset=utf-8')]
+             ('content-type', 'text/html;charset=utf-8'),
+             ('vary', 'Accept'),
+             ('content-length', str(len(response)))]
         )])
-        response = b''.join(response)
         self.assertTrue(response.startswith(b'<!DOCTYPE html>'))
 
     def test_custom_contenttype(self):
@@ -140,11 +292,413 @@ class TestHTTPException(unittest.TestCase):
         response = exc({'Foo': 1}, start_response)
         self.assertEqual(called, [(
             '200 OK',
-            [('content-type', 'application/json')]
+            [('content-type', 'application/json'),
+             ('content-length', '14')]
         )])
         response = b''.join(response)
         self.assertEqual(response, b'{"foo": "bar"}')
 
+    def test_call_mixed_case_contenttype(self):
+        exc = self._makeOne()
+        exc.setHeader('Content-Type', 'application/json')
+        exc.addHeader('Set-Cookie', 'a=1')
+        exc.addHeader('Set-Cookie', 'b=2')
+        exc.setBody('{}')
+
+        called = []
+
+        def start_response(status, headers):
+            called.append((status, headers))
+
+        exc({}, start_response)
+        self.assertEqual(called, [(
+            '500 Internal Server Error',
+            [('Content-Type', 'application/json'),
+             ('Set-Cookie', 'a=1'),
+             ('Set-Cookie', 'b=2'),
+             ('content-length', '2')]
+        )])
+
+    def test_call_default_headers_not_shared(self):
+        called = []
+
+        def start_response(status, headers):
+            called.append(headers)
+            headers.append(('x-foo', 'bar'))
+
+        exc = self._makeOne('Foo Error')
+        exc({}, start_response)
+        exc({}, start_response)
+        self.assertEqual(called[0][:1], called[1][:1])
+        self.assertEqual(called[1][-1], ('x-foo', 'bar'))
+        self.assertEqual(len(called[1]), 4)
+        self.assertEqual(exc.default_headers, (
+            ('content-type', 'text/html;charset=utf-8'),))
+
+    def test_call_custom_template(self):
+        class Custom(self._getTargetClass()):
+            body_template = '<h1>{title!h}</h1>{detail}'
+            title = 'Foo & Bar'
+
+        response = Custom('<p>Baz</p>')({}, lambda status, headers: None)
+        self.assertEqual(response, [b'<h1>Foo &amp; Bar</h1><p>Baz</p>'])
+
+    def test_call_instance_template(self):
+        exc = self._makeOne('Baz')
+        exc.body_template = '<h1>{title}</h1>{detail}'
+        exc.title = 'Foo'
+        response = exc({}, lambda status, headers: None)
+        self.assertEqual(response, [b'<h1>Foo</h1>Baz'])
+
+    def test_invalid_template_fails_at_class_definition(self):
+        with self.assertRaises(ValueError):
+            class Broken(self._getTargetClass()):
+                body_template = '<h1>{message}</h1>'
+
+    def test_call_accept_json(self):
+        exc = self._makeOne('Foo Error')
+        exc.setStatus(404)
+
+        called = []
+
+        def start_response(status, headers):
+            called.append((status, headers))
+
+        response = b''.join(exc({'HTTP_ACCEPT': 'application/json'},
+                                start_response))
+        self.assertEqual(json.loads(response), {
+            'status': 404, 'error': 'Not Found', 'detail': 'Foo Error'})
+        self.assertEqual(called, [(
+            '404 Not Found',
+            [('content-type', 'application/json'),
+             ('vary', 'Accept'),
+             ('content-length', str(len(response)))]
+        )])
+
+    def test_call_accept_text(self):
+        exc = self._makeOne()
+        exc.setHeader('Location', '/foo')
+
+        called = []
+
+        def start_response(status, headers):
+            called.append((status, headers))
+
+        response = exc({'HTTP_ACCEPT': 'text/plain'}, start_response)
+        self.assertEqual(response, [b'500 Internal Server Error\n'])
+        self.assertEqual(called, [(
+            '500 Internal Server Error',
+            [('Location', '/foo'),
+             ('content-type', 'text/plain;charset=utf-8'),
+             ('vary', 'Accept'),
+             ('content-length', '26')]
+        )])
+
+    def test_call_accept_json_detail_not_str(self):
+        class Detail:
+            def __str__(self):
+                return 'Some detail'
+
+        exc = self._makeOne('Foo Error')
+        exc.detail = Detail()
+        response = b''.join(exc({'HTTP_ACCEPT': 'application/json'},
+                                lambda status, headers: None))
+        self.assertEqual(json.loads(response), {
+            'status': 500, 'error': 'Internal Server Error',
+            'detail': 'Some detail'})
+
+    def test_call_vary_merged(self):
+        called = []
+
+        def start_response(status, headers):
+            called.append(headers)
+
+        exc = self._makeOne('Foo Error')
+        exc.setHeader('Vary', 'Cookie')
+        exc({}, start_response)
+        self.assertEqual(called[0][0], ('Vary', 'Cookie, Accept'))
+        exc.setHeader('Vary', 'accept, Cookie')
+        exc({}, start_response)
+        self.assertEqual(called[1][0], ('Vary', 'accept, Cookie'))
+        self.assertNotIn('vary', [name for name, value in called[1]])
+
+    def test_call_no_vary_for_custom_body(self):
+        called = []
+
+        def start_response(status, headers):
+            called.append(headers)
+
+        exc = self._makeOne('Foo Error')
+        exc.setBody('Foo')
+        exc({'HTTP_ACCEPT': 'application/json'}, start_response)
+        self.assertNotIn('vary', [name for name, value in called[0]])
+
+    def test_call_accept_explicit_content_type(self):
+        called = []
+
+        def start_response(status, headers):
+            called.append(headers)
+
+        exc = self._makeOne('Foo Error')
+        exc.setHeader('Content-Type', 'text/plain')
+        response = b''.join(
+            exc({'HTTP_ACCEPT': 'application/json'}, start_response))
+        self.assertTrue(response.startswith(b'<!DOCTYPE html>'))
+        self.assertEqual(called[0][0], ('Content-Type', 'text/plain'))
+        self.assertNotIn('vary', [name for name, value in called[0]])
+
+    def test_call_accept_custom_body(self):
+        exc = self._makeOne('Foo Error')
+        exc.setBody('<html>Foo</html>')
+        response = exc({'HTTP_ACCEPT': 'application/json'},
+                       lambda status, headers: None)
+        self.assertEqual(response, [b'<html>Foo</html>'])
+
+    def test_call_body_cache(self):
+        from zExceptions import body_cache
+        body_cache.clear()
+
+        def start_response(status, headers):
+            pass
+
+        first = self._makeOne('Foo Error')({}, start_response)
+        second = self._makeOne('Foo Error')({}, start_response)
+        self.assertEqual(first, second)
+        self.assertIs(first[0], second[0])
+        self.assertEqual(body_cache.stats()['hits'], 1)
+        self.assertEqual(body_cache.stats()['misses'], 1)
+
+        other = self._makeOne('Bar Error')({}, start_response)
+        self.assertIn(b'Bar Error', other[0])
+        self.assertEqual(body_cache.stats()['size'], 2)
+        body_cache.clear()
+
+    def test_call_body_cache_disabled(self):
+        from zExceptions import body_cache
+        body_cache.clear()
+
+        class Uncached(self._getTargetClass()):
+            cache_body = False
+
+        def start_response(status, headers):
+            pass
+
+        response = Uncached('Foo Error')({}, start_response)
+        self.assertIn(b'Foo Error', response[0])
+        self.assertEqual(len(body_cache), 0)
+
+
+class TestHTTPExceptionASGI(unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zExceptions import HTTPException
+        return HTTPException
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def _callASGI(self, exc, headers=()):
+        sent = []
+
+        async def receive():
+            raise AssertionError('The request body is not read.')
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'http', 'method': 'GET', 'path': '/',
+                 'headers': list(headers)}
+        asyncio.run(exc.asgi(scope, receive, send))
+        return sent
+
+    def test_asgi(self):
+        exc = self._makeOne('Foo Error')
+        start, body = self._callASGI(exc)
+        wsgi_body = exc({}, lambda status, headers: None)[0]
+        self.assertEqual(body, {'type': 'http.response.body',
+                                'body': wsgi_body})
+        self.assertEqual(start, {
+            'type': 'http.response.start',
+            'status': 500,
+            'headers': [(b'content-type', b'text/html;charset=utf-8'),
+                        (b'vary', b'Accept'),
+                        (b'content-length', str(len(wsgi_body)).encode())],
+        })
+
+    def test_asgi_extra_headers(self):
+        exc = self._makeOne()
+        exc.setBody('Foo')
+        exc.setHeader('Location', '/foo')
+        exc.addHeader('Set-Cookie', 'a=1')
+        exc.addHeader('Set-Cookie', 'b=2')
+        start, body = self._callASGI(exc)
+        self.assertEqual(start['headers'], [
+            (b'location', b'/foo'),
+            (b'set-cookie', b'a=1'),
+            (b'set-cookie', b'b=2'),
+            (b'content-type', b'text/html;charset=utf-8'),
+            (b'content-length', b'3')])
+        self.assertEqual(body['body'], b'Foo')
+
+    def test_asgi_accept_json(self):
+        exc = self._makeOne('Foo Error')
+        exc.setStatus(404)
+        start, body = self._callASGI(
+            exc, [(b'host', b'localhost'), (b'accept', b'application/json')])
+        self.assertEqual(start['status'], 404)
+        self.assertEqual(start['headers'][0],
+                         (b'content-type', b'application/json'))
+        self.assertEqual(json.loads(body['body']), {
+            'status': 404, 'error': 'Not Found', 'detail': 'Foo Error'})
+
+    def test_asgi_iterable_body(self):
+        closed = []
+
+        class Body(list):
+            def close(self):
+                closed.append(True)
+
+        exc = self._makeOne()
+        exc.setBody(Body(['<ul>', b'<li>\xce\xa9</li>', '</ul>']))
+        sent = self._callASGI(exc)
+        self.assertEqual(sent[0]['headers'],
+                         [(b'content-type', b'text/html;charset=utf-8')])
+        self.assertEqual(
+            [(m['body'], m.get('more_body', False)) for m in sent[1:]],
+            [(b'<ul>', True), (b'<li>\xce\xa9</li>', True),
+             (b'</ul>', True), (b'', False)])
+        self.assertEqual(closed, [True])
+
+    def test_asgi_empty_body(self):
+        exc = self._makeOne()
+        exc.empty_body = True
+        exc.setStatus(204)
+        self.assertEqual(self._callASGI(exc), [
+            {'type': 'http.response.start', 'status': 204, 'headers': []},
+            {'type': 'http.response.body', 'body': b''}])
+
+    def test_asgi_observed(self):
+        from zExceptions.instrumentation import StatsObserver
+        from zExceptions.instrumentation import register_observer
+        from zExceptions.instrumentation import unregister_observer
+        stats = StatsObserver()
+        register_observer(stats)
+        try:
+            self._callASGI(self._makeOne())
+        finally:
+            unregister_observer(stats)
+        self.assertEqual(stats.dump()['rendered']['by_status'], {500: 1})
+
+
+class TestStatusLines(unittest.TestCase):
+
+    def test_status_lines(self):
+        from zExceptions import status_lines
+        from zExceptions import status_reasons
+        self.assertEqual(set(status_lines), set(status_reasons))
+        self.assertEqual(status_lines[404], '404 Not Found')
+        self.assertIs(status_lines[404], status_lines[404])
+
+
+class TestStatusMap(unittest.TestCase):
+
+    def _callFUT(self, status):
+        from zExceptions import exception_for_status
+        return exception_for_status(status)
+
+    def test_known_statuses(self):
+        from zExceptions import BadRequest
+        from zExceptions import HTTPGone
+        from zExceptions import HTTPTooManyRequests
+        from zExceptions import InternalError
+        from zExceptions import NotFound
+        from zExceptions import Unauthorized
+        self.assertIs(self._callFUT(400), BadRequest)
+        self.assertIs(self._callFUT(401), Unauthorized)
+        self.assertIs(self._callFUT(404), NotFound)
+        self.assertIs(self._callFUT(410), HTTPGone)
+        self.assertIs(self._callFUT(429), HTTPTooManyRequests)
+        self.assertIs(self._callFUT(500), InternalError)
+
+    def test_unknown_statuses(self):
+        self.assertIsNone(self._callFUT(499))
+        self.assertIsNone(self._callFUT(-1))
+        self.assertIsNone(self._callFUT(1000))
+
+    def test_subclasses_elsewhere_do_not_take_over(self):
+        from zExceptions import HTTPException
+        from zExceptions import NotFound
+
+        class MyNotFound(NotFound):
+            pass
+
+        class MyError(HTTPException):
+            pass
+
+        self.assertIs(self._callFUT(404), NotFound)
+        self.assertEqual(self._callFUT(500).__name__, 'InternalError')
+
+    def test_new_status_is_registered(self):
+        from zExceptions import HTTPClientError
+        from zExceptions import status_map
+
+        class HTTPMisdirectedRequest(HTTPClientError):
+            errmsg = 'Misdirected Request'
+            status = 421
+
+        try:
+            self.assertIs(self._callFUT(421), HTTPMisdirectedRequest)
+        finally:
+            status_map[421] = None
+
+
+class TestRaiseForStatus(unittest.TestCase):
+
+    def _callFUT(self, status, detail=None):
+        from zExceptions import raise_for_status
+        return raise_for_status(status, detail=detail)
+
+    def test_success_does_not_raise(self):
+        self.assertIsNone(self._callFUT(200))
+        self.assertIsNone(self._callFUT(302))
+
+    def test_known_status(self):
+        from zExceptions import HTTPGone
+        with self.assertRaises(HTTPGone) as ctx:
+            self._callFUT(410, detail='It is gone.')
+        self.assertEqual(str(ctx.exception), 'It is gone.')
+
+    def test_unknown_client_status(self):
+        from zExceptions import HTTPClientError
+        with self.assertRaises(HTTPClientError) as ctx:
+            self._callFUT(499)
+        self.assertEqual(ctx.exception.getStatus(), 499)
+        self.assertEqual(ctx.exception.errmsg, 'Unknown')
+
+    def test_unknown_server_status(self):
+        from zExceptions import HTTPServerError
+        with self.assertRaises(HTTPServerError) as ctx:
+            self._callFUT(599)
+        self.assertEqual(ctx.exception.getStatus(), 599)
+
+    def test_unknown_status_renders(self):
+        from zExceptions import HTTPException
+        for status in (499, 520, 599):
+            with self.assertRaises(HTTPException) as ctx:
+                self._callFUT(status, detail='Odd status')
+            called = []
+
+            def start_response(status, headers):
+                called.append(status)
+
+            response = b''.join(ctx.exception({}, start_response))
+            self.assertEqual(called, ['%d Unknown' % status])
+            self.assertTrue(response.startswith(b'<!DOCTYPE html>'))
+
+    def test_invalid_status(self):
+        with self.assertRaises(ValueError):
+            self._callFUT(600)
+
 
 class TestRedirect(unittest.TestCase):
 
@@ -198,6 +752,65 @@ class TestConvertExceptionType(unittest.TestCase):
     def test_name_in_zExceptions_not_an_exception_returns_None(self):
         self.assertIsNone(self._callFUT('convertExceptionType'))
 
+    def test_unknown_name_returns_None(self):
+        self.assertIsNone(self._callFUT('NoSuchError'))
+        self.assertIsNone(self._callFUT('NoSuchError'))
+
+    def test_name_assigned_to_zExceptions_later(self):
+        import zExceptions
+
+        class LateError(Exception):
+            pass
+
+        self.assertIsNone(self._callFUT('LateError'))
+        zExceptions.LateError = LateError
+        try:
+            self.assertIs(self._callFUT('LateError'), LateError)
+        finally:
+            del zExceptions.LateError
+            zExceptions._exception_types = None
+
+
+class TestRegisterExceptionType(unittest.TestCase):
+
+    def tearDown(self):
+        import zExceptions
+        zExceptions._registered_exception_types.clear()
+        zExceptions._exception_types = None
+
+    def _callFUT(self, name, cls):
+        from zExceptions import register_exception_type
+        return register_exception_type(name, cls)
+
+    def test_register_new_name(self):
+        from zExceptions import convertExceptionType
+
+        class ConflictError(Exception):
+            pass
+
+        self.assertIsNone(convertExceptionType('ConflictError'))
+        self._callFUT('ConflictError', ConflictError)
+        self.assertIs(convertExceptionType('ConflictError'), ConflictError)
+
+    def test_register_overrides_existing(self):
+        from zExceptions import NotFound
+        from zExceptions import convertExceptionType
+        from zExceptions import upgradeException
+
+        class MyNotFound(NotFound):
+            pass
+
+        self._callFUT('NotFound', MyNotFound)
+        self.assertIs(convertExceptionType('NotFound'), MyNotFound)
+        t, v = upgradeException(NotFound, 'TEST')
+        self.assertIs(t, MyNotFound)
+
+    def test_register_non_exception(self):
+        with self.assertRaises(TypeError):
+            self._callFUT('Foo', object)
+        with self.assertRaises(TypeError):
+            self._callFUT('Foo', 'Foo')
+
 
 class TestUpgradeException(unittest.TestCase):
 
@@ -0,0 +1,191 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Unit tests for asyncformat module.
+"""
+
+import threading
+import unittest
+import weakref
+
+from zExceptions.tests.helpers import Marker
+from zExceptions.tests.helpers import excInfo
+
+
+class Blocking:
+    """A traceback supplement blocking the worker until released."""
+
+    entered = None
+    release = None
+    last_thread = None
+
+    def __init__(self, name):
+        self.expression = name
+        Blocking.last_thread = threading.current_thread().name
+        self.entered.set()
+        self.release.wait(5)
+
+
+class AsyncExceptionFormatterTests(unittest.TestCase):
+
+    def setUp(self):
+        Blocking.entered = threading.Event()
+        Blocking.release = threading.Event()
+        self._formatters = []
+
+    def tearDown(self):
+        Blocking.release.set()
+        for formatter in self._formatters:
+            formatter.shutdown()
+
+    def _makeOne(self, *args, **kw):
+        from zExceptions.asyncformat import AsyncExceptionFormatter
+        formatter = AsyncExceptionFormatter(*args, **kw)
+        self._formatters.append(formatter)
+        return formatter
+
+    def test_result(self):
+        from zExceptions.ExceptionFormatter import format_exception
+        formatter = self._makeOne()
+        t, v, b = excInfo()
+        for as_html in (0, 1):
+            future = formatter.submit(t, v, b, as_html=as_html)
+            self.assertEqual(future.result(5),
+                             format_exception(t, v, b, as_html=as_html))
+
+    def test_limit(self):
+        from zExceptions.ExceptionFormatter import format_exception
+        formatter = self._makeOne()
+        t, v, b = excInfo()
+        result = formatter.submit(t, v, b, limit=1).result(5)
+        self.assertEqual(result, format_exception(t, v, b, limit=1))
+
+    def test_supplement_evaluated_in_worker(self):
+        formatter = self._makeOne(evaluate_in_worker=True)
+        Blocking.release.set()
+        t, v, b = excInfo(supplement=(Blocking, 'Foo'))
+        result = ''.join(formatter.submit(t, v, b).result(5))
+        self.assertIn('Expression: Foo', result)
+        self.assertEqual(Blocking.last_thread, 'zExceptions-formatter-0')
+
+    def test_supplement_evaluated_in_caller(self):
+        formatter = self._makeOne()
+        Blocking.release.set()
+        t, v, b = excInfo(supplement=(Blocking, 'Foo'))
+        # The supplement was already evaluated when submit returned.
+        self.assertFalse(Blocking.entered.is_set())
+        future = formatter.submit(t, v, b)
+        self.assertTrue(Blocking.entered.is_set())
+        self.assertIn('Expression: Foo', ''.join(future.result(5)))
+        self.assertEqual(Blocking.last_thread,
+                         threading.current_thread().name)
+
+    def test_frames_released(self):
+        formatter = self._makeOne(evaluate_in_worker=True)
+        marker = Marker()
+        ref = weakref.ref(marker)
+        t, v, b = excInfo(supplement=(Blocking, 'Foo'), obj=marker)
+        future = formatter.submit(t, v, b)
+        del marker, t, v, b
+        self.assertTrue(Blocking.entered.wait(5))
+        self.assertIsNone(ref())
+        Blocking.release.set()
+        self.assertIn("ValueError: Foo", future.result(5)[-1])
+
+    def test_drop_new(self):
+        from zExceptions.asyncformat import FormattingDropped
+        formatter = self._makeOne(maxsize=1, evaluate_in_worker=True)
+        t, v, b = excInfo(supplement=(Blocking, 'Foo'))
+        first = formatter.submit(t, v, b)
+        self.assertTrue(Blocking.entered.wait(5))
+        second = formatter.submit(t, v, b)
+        third = formatter.submit(t, v, b)
+        with self.assertRaises(FormattingDropped):
+            third.result(5)
+        Blocking.release.set()
+        first.result(5)
+        second.result(5)
+        self.assertEqual(formatter.submitted, 3)
+        self.assertEqual(formatter.dropped, 1)
+
+    def test_drop_oldest(self):
+        from zExceptions.asyncformat import FormattingDropped
+        formatter = self._makeOne(maxsize=1, drop_oldest=True,
+                                  evaluate_in_worker=True)
+        t, v, b = excInfo(supplement=(Blocking, 'Foo'))
+        first = formatter.submit(t, v, b)
+        self.assertTrue(Blocking.entered.wait(5))
+        second = formatter.submit(t, v, b)
+        third = formatter.submit(t, v, b)
+        with self.assertRaises(FormattingDropped):
+            second.result(5)
+        Blocking.release.set()
+        first.result(5)
+        third.result(5)
+        self.assertEqual(formatter.dropped, 1)
+
+    def test_cancelled(self):
+        formatter = self._makeOne(evaluate_in_worker=True)
+        t, v, b = excInfo(supplement=(Blocking, 'Foo'))
+        first = formatter.submit(t, v, b)
+        self.assertTrue(Blocking.entered.wait(5))
+        second = formatter.submit(t, v, b)
+        self.assertTrue(second.cancel())
+        Blocking.release.set()
+        first.result(5)
+        formatter.shutdown()
+        self.assertTrue(second.cancelled())
+
+    def test_formatting_error(self):
+        formatter = self._makeOne()
+
+        class Broken:
+            def iterFormatFrames(self, tb, limit=None):
+                raise KeyError('broken')
+
+        t, v, b = excInfo()
+        future = formatter.submit(t, v, b)
+        future.result(5)
+        from concurrent.futures import Future
+        future = Future()
+        formatter._queue.put((future, Broken(), None, [], None))
+        with self.assertRaises(KeyError):
+            future.result(5)
+
+    def test_shutdown(self):
+        formatter = self._makeOne(workers=2)
+        t, v, b = excInfo()
+        formatter.submit(t, v, b).result(5)
+        formatter.shutdown()
+        with self.assertRaises(RuntimeError):
+            formatter.submit(t, v, b)
+
+
+class FormatExceptionAsyncTests(unittest.TestCase):
+
+    def setUp(self):
+        # Use a private formatter, so no worker thread is left behind.
+        from zExceptions import asyncformat
+        from zExceptions.asyncformat import AsyncExceptionFormatter
+        formatter = AsyncExceptionFormatter()
+        self.addCleanup(formatter.shutdown)
+        self.addCleanup(setattr, asyncformat, 'async_formatter',
+                        asyncformat.async_formatter)
+        asyncformat.async_formatter = formatter
+
+    def test_format_exception_async(self):
+        from zExceptions.asyncformat import format_exception_async
+        from zExceptions.ExceptionFormatter import format_exception
+        t, v, b = excInfo()
+        self.assertEqual(format_exception_async(t, v, b).result(5),
+                         format_exception(t, v, b))
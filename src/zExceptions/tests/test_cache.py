@@ -0,0 +1,65 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Unit tests for cache module.
+"""
+
+import unittest
+
+
+class LRUCacheTests(unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zExceptions.cache import LRUCache
+        return LRUCache
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def test_get_miss(self):
+        cache = self._makeOne()
+        self.assertIsNone(cache.get('foo'))
+        self.assertEqual(cache.get('foo', 'default'), 'default')
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_set_and_get(self):
+        cache = self._makeOne()
+        cache.set('foo', 1)
+        self.assertEqual(cache.get('foo'), 1)
+        self.assertIn('foo', cache)
+        self.assertEqual(cache.stats(), {
+            'hits': 1, 'misses': 0, 'size': 1, 'maxsize': 128})
+
+    def test_evicts_least_recently_used(self):
+        cache = self._makeOne(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_disabled(self):
+        cache = self._makeOne(0)
+        cache.set('a', 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_clear(self):
+        cache = self._makeOne()
+        cache.set('a', 1)
+        cache.get('a')
+        cache.clear()
+        self.assertEqual(cache.stats(), {
+            'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 128})
@@ -0,0 +1,110 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Unit tests for controlflow module.
+"""
+
+import gc
+import threading
+import unittest
+import weakref
+
+
+class Local:
+    pass
+
+
+def traverse(exc):
+    raise exc
+
+
+def traverseWithLocal(exc, refs):
+    local = Local()
+    refs.append(weakref.ref(local))
+    raise exc
+
+
+class ControlFlowExceptionTests(unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zExceptions.controlflow import ControlFlowUnauthorized
+        return ControlFlowUnauthorized
+
+    def test_isinstance(self):
+        from zExceptions import Unauthorized
+        self.assertIsInstance(self._getTargetClass().instance(),
+                              Unauthorized)
+
+    def test_interfaces(self):
+        from zope.security.interfaces import IUnauthorized
+        exc = self._getTargetClass().instance()
+        self.assertTrue(IUnauthorized.providedBy(exc))
+
+    def test_status_map_unchanged(self):
+        from zExceptions import Unauthorized
+        from zExceptions import exception_for_status
+        self.assertIs(exception_for_status(401), Unauthorized)
+
+    def test_shared(self):
+        klass = self._getTargetClass()
+        self.assertIs(klass.instance(), klass.instance())
+
+    def test_per_thread(self):
+        klass = self._getTargetClass()
+        other = []
+        thread = threading.Thread(
+            target=lambda: other.append(klass.instance()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], klass.instance())
+
+    def test_no_growing_traceback(self):
+        from zExceptions import Unauthorized
+        klass = self._getTargetClass()
+        for i in range(3):
+            try:
+                try:
+                    raise ValueError()
+                except ValueError:
+                    traverse(klass.instance())
+            except Unauthorized as e:
+                exc = e
+                self.assertIsInstance(exc.__context__, ValueError)
+        count = 0
+        tb = exc.__traceback__
+        while tb is not None:
+            count += 1
+            tb = tb.tb_next
+        self.assertEqual(count, 2)
+        self.assertIs(klass.instance(), exc)
+        self.assertIsNone(exc.__traceback__)
+        self.assertIsNone(exc.__context__)
+        self.assertIsNone(exc.__cause__)
+
+    def test_clear_releases_frame_locals(self):
+        from zExceptions import Unauthorized
+        klass = self._getTargetClass()
+        refs = []
+        try:
+            traverseWithLocal(klass.instance(), refs)
+        except Unauthorized as exc:
+            # The shared instance keeps the frame alive after the except.
+            handled = exc
+        gc.collect()
+        self.assertIsNotNone(refs[0]())
+        handled.clear()
+        gc.collect()
+        self.assertIsNone(refs[0]())
+        self.assertIsNone(handled.__traceback__)
+        self.assertIsNone(handled.__context__)
+        self.assertIsNone(handled.__cause__)
@@ -0,0 +1,134 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Unit tests for headers module.
+"""
+
+import unittest
+
+
+class HTTPHeadersTests(unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zExceptions.headers import HTTPHeaders
+        return HTTPHeaders
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def test_empty(self):
+        headers = self._makeOne()
+        self.assertEqual(len(headers), 0)
+        self.assertEqual(headers.items(), [])
+        self.assertIsNone(headers.get('Location'))
+        self.assertNotIn('Location', headers)
+        self.assertNotIn(None, headers)
+
+    def test_index_built_lazily(self):
+        headers = self._makeOne()
+        headers.set('Location', '/foo')
+        headers.add('Set-Cookie', 'a=1')
+        self.assertIsNone(headers._index)
+        headers.set('location', '/bar')
+        self.assertEqual(headers['SET-COOKIE'], 'a=1')
+        self.assertEqual(headers._index, {
+            'location': '/bar', 'set-cookie': 'a=1'})
+        headers.add('Set-Cookie', 'b=2')
+        headers.add('X-Foo', 'bar')
+        self.assertEqual(headers['x-foo'], 'bar')
+        self.assertEqual(headers['set-cookie'], 'a=1')
+
+    def test_init_from_mapping(self):
+        headers = self._makeOne({'Location': '/foo'})
+        self.assertEqual(headers.items(), [('Location', '/foo')])
+
+    def test_case_insensitive_lookup(self):
+        headers = self._makeOne()
+        headers.set('Content-Type', 'text/plain')
+        self.assertIn('content-type', headers)
+        self.assertEqual(headers['CONTENT-TYPE'], 'text/plain')
+        self.assertEqual(headers.get('content-type'), 'text/plain')
+
+    def test_getitem_missing(self):
+        headers = self._makeOne()
+        with self.assertRaises(KeyError):
+            headers['Location']
+
+    def test_set_replaces_in_place(self):
+        headers = self._makeOne()
+        headers.add('Set-Cookie', 'a=1')
+        headers.add('Location', '/foo')
+        headers.add('set-cookie', 'b=2')
+        headers['SET-COOKIE'] = 'c=3'
+        self.assertEqual(headers.items(), [
+            ('SET-COOKIE', 'c=3'), ('Location', '/foo')])
+        self.assertEqual(headers.getAll('set-cookie'), ['c=3'])
+
+    def test_add_keeps_all_values(self):
+        headers = self._makeOne()
+        headers.add('WWW-Authenticate', 'basic realm="a"')
+        headers.add('WWW-Authenticate', 'bearer')
+        self.assertEqual(headers['www-authenticate'], 'basic realm="a"')
+        self.assertEqual(headers.getAll('WWW-Authenticate'),
+                         ['basic realm="a"', 'bearer'])
+        self.assertEqual(headers.getAll('Location'), [])
+        self.assertEqual(headers.keys(), ['WWW-Authenticate'])
+        self.assertEqual(list(headers), ['WWW-Authenticate'])
+        self.assertEqual(len(headers), 2)
+
+    def test_remove(self):
+        headers = self._makeOne()
+        headers.add('Set-Cookie', 'a=1')
+        headers.add('Location', '/foo')
+        headers.add('set-cookie', 'b=2')
+        self.assertTrue(headers.remove('SET-COOKIE'))
+        self.assertFalse(headers.remove('SET-COOKIE'))
+        self.assertEqual(headers.items(), [('Location', '/foo')])
+        del headers['location']
+        self.assertEqual(headers.items(), [])
+        with self.assertRaises(KeyError):
+            del headers['location']
+
+    def test_items_is_a_copy(self):
+        headers = self._makeOne({'Location': '/foo'})
+        headers.items().append(('X-Foo', 'bar'))
+        self.assertEqual(headers.items(), [('Location', '/foo')])
+
+    def test_copy(self):
+        headers = self._makeOne({'Location': '/foo'})
+        other = headers.copy()
+        other.add('X-Foo', 'bar')
+        self.assertEqual(headers.copy()['location'], '/foo')
+        self.assertEqual(headers.copy()['location'], '/foo')
+        self.assertEqual(headers, {'Location': '/foo'})
+        self.assertNotEqual(headers, other)
+
+    def test_equality(self):
+        headers = self._makeOne({'Location': '/foo'})
+        self.assertEqual(headers, {'Location': '/foo'})
+        self.assertEqual(headers, self._makeOne([('Location', '/foo')]))
+        self.assertNotEqual(headers, {'location': '/foo'})
+        self.assertNotEqual(headers, [('Location', '/foo')])
+
+    def test_repr(self):
+        headers = self._makeOne({'Location': '/foo'})
+        self.assertEqual(repr(headers), "HTTPHeaders([('Location', '/foo')])")
+
+    def test_pickle(self):
+        import pickle
+        headers = self._makeOne([('Set-Cookie', 'a=1'), ('Set-Cookie', 'b=2')])
+        headers.get('set-cookie')
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copy = pickle.loads(pickle.dumps(headers, protocol))
+            self.assertEqual(copy, headers)
+            self.assertEqual(copy.getAll('set-cookie'), ['a=1', 'b=2'])
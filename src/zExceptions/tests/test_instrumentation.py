@@ -0,0 +1,206 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Unit tests for instrumentation module.
+"""
+
+import sys
+import unittest
+
+
+def _startResponse(status, headers):
+    pass
+
+
+class PercentilesTests(unittest.TestCase):
+
+    def _callFUT(self, samples, **kw):
+        from zExceptions.instrumentation import percentiles
+        return percentiles(samples, **kw)
+
+    def test_empty(self):
+        self.assertEqual(self._callFUT([]), {})
+
+    def test_percentiles(self):
+        samples = list(range(101))
+        self.assertEqual(self._callFUT(reversed(samples)),
+                         {'p50': 50, 'p90': 90, 'p99': 99, 'max': 100})
+        self.assertEqual(self._callFUT([3], points=(10,)),
+                         {'p10': 3, 'max': 3})
+
+
+class ObserverTests(unittest.TestCase):
+
+    def setUp(self):
+        from zExceptions.instrumentation import ExceptionObserver
+        from zExceptions.instrumentation import register_observer
+        events = self.events = []
+
+        class Observer(ExceptionObserver):
+            def rendered(self, exc, seconds):
+                events.append(('rendered', exc, seconds))
+
+            def formatted(self, etype, value, seconds):
+                events.append(('formatted', etype, value, seconds))
+
+        self.observer = Observer()
+        register_observer(self.observer)
+
+    def tearDown(self):
+        from zExceptions.instrumentation import unregister_observer
+        unregister_observer(self.observer)
+
+    def test_register_twice(self):
+        from zExceptions.instrumentation import observers
+        from zExceptions.instrumentation import register_observer
+        register_observer(self.observer)
+        self.assertEqual(observers.count(self.observer), 1)
+
+    def test_unregister(self):
+        from zExceptions import NotFound
+        from zExceptions.instrumentation import observers
+        from zExceptions.instrumentation import unregister_observer
+        unregister_observer(self.observer)
+        unregister_observer(self.observer)
+        self.assertNotIn(self.observer, observers)
+        NotFound()({}, _startResponse)
+        self.assertEqual(self.events, [])
+
+    def test_rendered(self):
+        from zExceptions import NotFound
+        exc = NotFound()
+        self.assertEqual(exc({}, _startResponse), [exc._getResponseBody()[0]])
+        [(event, observed, seconds)] = self.events
+        self.assertEqual(event, 'rendered')
+        self.assertIs(observed, exc)
+        self.assertGreaterEqual(seconds, 0)
+
+    def test_formatted(self):
+        from zExceptions.ExceptionFormatter import format_exception
+        try:
+            raise ValueError('Foo')
+        except ValueError:
+            t, v, b = sys.exc_info()
+            lines = format_exception(t, v, b)
+            del b
+        self.assertEqual(lines[-1], 'ValueError: Foo\n')
+        [(event, etype, value, seconds)] = self.events
+        self.assertEqual(event, 'formatted')
+        self.assertIs(etype, ValueError)
+        self.assertIs(value, v)
+        self.assertGreaterEqual(seconds, 0)
+
+
+class FailingObserverTests(unittest.TestCase):
+
+    def setUp(self):
+        from zExceptions.instrumentation import ExceptionObserver
+        from zExceptions.instrumentation import StatsObserver
+        from zExceptions.instrumentation import register_observer
+
+        class Failing(ExceptionObserver):
+            def rendered(self, exc, seconds):
+                raise RuntimeError('observer bug')
+
+            def formatted(self, etype, value, seconds):
+                raise RuntimeError('observer bug')
+
+        self.failing = Failing()
+        self.stats = StatsObserver()
+        register_observer(self.failing)
+        register_observer(self.stats)
+
+    def tearDown(self):
+        from zExceptions.instrumentation import unregister_observer
+        unregister_observer(self.failing)
+        unregister_observer(self.stats)
+
+    def test_rendered(self):
+        from zExceptions import NotFound
+        called = []
+        with self.assertLogs('zExceptions.instrumentation') as logs:
+            response = NotFound()(
+                {}, lambda status, headers: called.append(status))
+        self.assertEqual(called, ['404 Not Found'])
+        self.assertEqual(len(response), 1)
+        self.assertIn('observer bug', logs.output[0])
+        # Later observers are still called.
+        self.assertEqual(self.stats.dump()['rendered']['count'], 1)
+
+    def test_formatted(self):
+        from zExceptions.ExceptionFormatter import format_exception
+        try:
+            raise ValueError('Foo')
+        except ValueError:
+            t, v, b = sys.exc_info()
+            with self.assertLogs('zExceptions.instrumentation'):
+                lines = format_exception(t, v, b)
+            del b
+        self.assertEqual(lines[-1], 'ValueError: Foo\n')
+        self.assertEqual(self.stats.dump()['formatted']['count'], 1)
+
+
+class StatsObserverTests(unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zExceptions.instrumentation import StatsObserver
+        return StatsObserver
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def test_empty(self):
+        stats = self._makeOne()
+        self.assertEqual(stats.dump(), {
+            'rendered': {'count': 0, 'by_class': {}, 'latency': {}},
+            'formatted': {'count': 0, 'by_class': {}, 'latency': {}},
+        })
+
+    def test_dump(self):
+        from zExceptions import Forbidden
+        from zExceptions import NotFound
+        stats = self._makeOne(samples=2)
+        stats.rendered(NotFound(), 0.5)
+        stats.rendered(NotFound(), 0.25)
+        stats.rendered(Forbidden(), 0.125)
+        stats.formatted(ValueError, ValueError(), 1.0)
+        self.assertEqual(stats.dump(), {
+            'rendered': {
+                'count': 3,
+                'by_status': {404: 2, 403: 1},
+                'by_class': {'zExceptions.NotFound': 2,
+                             'zExceptions.Forbidden': 1},
+                # Only the last two samples are kept.
+                'latency': {'p50': 0.125, 'p90': 0.25, 'p99': 0.25,
+                            'max': 0.25},
+            },
+            'formatted': {
+                'count': 1,
+                'by_class': {'builtins.ValueError': 1},
+                'latency': {'p50': 1.0, 'p90': 1.0, 'p99': 1.0, 'max': 1.0},
+            },
+        })
+        stats.clear()
+        self.assertEqual(stats.dump()['rendered']['count'], 0)
+
+    def test_registered(self):
+        from zExceptions import NotFound
+        from zExceptions.instrumentation import register_observer
+        from zExceptions.instrumentation import unregister_observer
+        stats = self._makeOne()
+        register_observer(stats)
+        try:
+            NotFound()({}, _startResponse)
+        finally:
+            unregister_observer(stats)
+        self.assertEqual(stats.dump()['rendered']['by_status'], {404: 1})
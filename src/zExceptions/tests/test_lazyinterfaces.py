@@ -0,0 +1,97 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Unit tests for lazyinterfaces module.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+MODULE = '''\
+from zope.interface import Interface
+
+
+class IFoo(Interface):
+    pass
+'''
+
+SCRIPT = '''\
+import sys
+import zExceptions
+assert not [name for name in sys.modules
+            if name.startswith(('zope.publisher', 'zope.security'))]
+from zope.publisher.interfaces import INotFound
+from zope.publisher.interfaces.http import IHTTPException
+from zope.security.interfaces import IUnauthorized
+assert INotFound.providedBy(zExceptions.NotFound())
+assert IHTTPException.providedBy(zExceptions.HTTPGone())
+assert IUnauthorized.providedBy(zExceptions.Unauthorized())
+'''
+
+
+class LazyImplementerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.module_name = 'zexceptions_lazy_%d' % id(self)
+        with open(os.path.join(self.path, self.module_name + '.py'),
+                  'w') as f:
+            f.write(MODULE)
+        sys.path.insert(0, self.path)
+
+    def tearDown(self):
+        sys.path.remove(self.path)
+        sys.modules.pop(self.module_name, None)
+        shutil.rmtree(self.path)
+
+    def _callFUT(self, module_name, interface_name):
+        from zExceptions.lazyinterfaces import lazy_implementer
+        return lazy_implementer(module_name, interface_name)
+
+    def test_declared_on_import(self):
+        import importlib
+
+        from zExceptions.lazyinterfaces import _finder
+        from zExceptions.lazyinterfaces import _pending
+
+        @self._callFUT(self.module_name, 'IFoo')
+        class Foo:
+            pass
+
+        self.assertIn(_finder, sys.meta_path)
+        self.assertIn(self.module_name, _pending)
+        module = importlib.import_module(self.module_name)
+        self.assertTrue(module.IFoo.implementedBy(Foo))
+        self.assertNotIn(self.module_name, _pending)
+
+    def test_already_imported(self):
+        import importlib
+
+        from zExceptions.lazyinterfaces import _pending
+        module = importlib.import_module(self.module_name)
+
+        @self._callFUT(self.module_name, 'IFoo')
+        class Foo:
+            pass
+
+        self.assertTrue(module.IFoo.implementedBy(Foo))
+        self.assertNotIn(self.module_name, _pending)
+
+    def test_exception_classes(self):
+        # Needs a fresh interpreter which did not import the interfaces.
+        subprocess.check_call([sys.executable, '-c', SCRIPT])
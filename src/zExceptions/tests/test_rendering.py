@@ -0,0 +1,133 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Unit tests for rendering module.
+"""
+
+import json
+import unittest
+
+
+class ParseAcceptTests(unittest.TestCase):
+
+    def _callFUT(self, accept):
+        from zExceptions.rendering import parseAccept
+        return parseAccept(accept)
+
+    def test_simple(self):
+        self.assertEqual(self._callFUT('application/json'),
+                         [('application/json', 1.0)])
+
+    def test_quality(self):
+        self.assertEqual(
+            self._callFUT('Text/HTML, application/json;q=0.5 ,, */*; q=x'),
+            [('text/html', 1.0), ('application/json', 0.5), ('*/*', 0.0)])
+
+
+class NegotiateTests(unittest.TestCase):
+
+    def _callFUT(self, accept):
+        from zExceptions.rendering import negotiate
+        return negotiate(accept).media_type
+
+    def test_no_accept(self):
+        self.assertEqual(self._callFUT(None), 'text/html')
+        self.assertEqual(self._callFUT(''), 'text/html')
+
+    def test_browser(self):
+        self.assertEqual(self._callFUT(
+            'text/html,application/xhtml+xml,application/xml;q=0.9,'
+            '*/*;q=0.8'), 'text/html')
+
+    def test_anything(self):
+        self.assertEqual(self._callFUT('*/*'), 'text/html')
+
+    def test_json(self):
+        self.assertEqual(self._callFUT('application/json'),
+                         'application/json')
+        self.assertEqual(self._callFUT('application/json, text/plain, */*'),
+                         'application/json')
+
+    def test_text(self):
+        self.assertEqual(self._callFUT('text/*'), 'text/html')
+        self.assertEqual(self._callFUT('text/plain'), 'text/plain')
+        self.assertEqual(self._callFUT('text/html;q=0.1, text/plain'),
+                         'text/plain')
+
+    def test_nothing_acceptable(self):
+        self.assertEqual(self._callFUT('image/png'), 'text/html')
+        self.assertEqual(self._callFUT('application/json;q=0'), 'text/html')
+
+
+class RegisterRendererTests(unittest.TestCase):
+
+    def setUp(self):
+        from zExceptions import rendering
+        self._renderers = list(rendering.renderers)
+
+    def tearDown(self):
+        from zExceptions import rendering
+        rendering.renderers[:] = self._renderers
+        rendering._negotiated.clear()
+
+    def _callFUT(self, *args, **kw):
+        from zExceptions.rendering import register_renderer
+        return register_renderer(*args, **kw)
+
+    def test_new_media_type(self):
+        from zExceptions.rendering import negotiate
+        self.assertEqual(negotiate('application/xml').media_type,
+                         'text/html')
+        renderer = self._callFUT('application/xml', lambda *args: '<error/>')
+        self.assertEqual(renderer.content_type, 'application/xml')
+        self.assertIs(negotiate('application/xml'), renderer)
+
+    def test_replace_media_type(self):
+        from zExceptions import rendering
+        count = len(rendering.renderers)
+        renderer = self._callFUT('application/json', lambda *args: '{}',
+                                 'application/problem+json')
+        self.assertEqual(len(rendering.renderers), count)
+        self.assertIs(rendering.negotiate('application/json'), renderer)
+        self.assertEqual(repr(renderer), '<ErrorRenderer application/json>')
+
+    def test_uncached(self):
+        from zExceptions import NotFound
+        exc = NotFound('No such thing.')
+        self._callFUT('application/xml', lambda exc, *args: exc.path,
+                      cache=False)
+        for path in ('/a', '/b'):
+            exc.path = path
+            response = exc({'HTTP_ACCEPT': 'application/xml'},
+                           lambda status, headers: None)
+            self.assertEqual(response, [path.encode('ascii')])
+
+
+class RendererTests(unittest.TestCase):
+
+    def _makeException(self):
+        from zExceptions import NotFound
+        return NotFound('No such thing.')
+
+    def test_json(self):
+        from zExceptions.rendering import renderJSON
+        body = renderJSON(self._makeException(), 'Title', 'No such thing.')
+        self.assertEqual(json.loads(body), {
+            'status': 404, 'error': 'Not Found', 'detail': 'No such thing.'})
+
+    def test_text(self):
+        from zExceptions.rendering import renderText
+        exc = self._makeException()
+        self.assertEqual(renderText(exc, 'Title', 'No such thing.'),
+                         '404 Not Found\n\nNo such thing.\n')
+        self.assertEqual(renderText(exc, 'Title', ''), '404 Not Found\n')
@@ -0,0 +1,133 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Unit tests for snapshot module.
+"""
+
+import pickle
+import unittest
+import weakref
+
+from zExceptions.tests import helpers
+from zExceptions.tests.helpers import Marker
+
+
+class Supplement:
+
+    source_url = '/somepath'
+    line = -1
+    column = 57
+    warnings = ['Repent, for the end is nigh']
+
+    def __init__(self, expression, obj=None):
+        self.expression = expression
+        self.object = obj
+
+    def getInfo(self, as_html=0):
+        if as_html:
+            return '<i>Extra</i>'
+        return 'Extra'
+
+
+class Broken:
+
+    def __init__(self):
+        raise RuntimeError('broken supplement')
+
+
+def excInfoWithSupplement(obj=None, broken=False):
+    if broken:
+        supplement = (Broken,)
+    else:
+        supplement = (Supplement, 'a & b', obj)
+    return helpers.excInfo(info='Adam & Eve', supplement=supplement)
+
+
+class TracebackSnapshotTests(unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zExceptions.snapshot import TracebackSnapshot
+        return TracebackSnapshot
+
+    def _capture(self, **kw):
+        return self._getTargetClass().capture(*excInfoWithSupplement(**kw))
+
+    def test_capture(self):
+        snapshot = self._capture(obj=Marker())
+        self.assertEqual(snapshot.exc_type, 'builtins.ValueError')
+        self.assertEqual(snapshot.exc_lines, ('ValueError: Foo\n',))
+        self.assertEqual(len(snapshot.frames), 2)
+        (modname, lineno, name, filename, revision, supplement, tbi,
+         formatting) = snapshot.frames[-1]
+        self.assertEqual(modname, helpers.__name__)
+        self.assertEqual(name, 'fail')
+        self.assertEqual(filename, helpers.__file__)
+        self.assertIsNone(revision)
+        self.assertEqual(supplement, (
+            '<Marker>', '/somepath', lineno, 57, 'a & b',
+            ('Repent, for the end is nigh',), 'Extra', '<i>Extra</i>'))
+        self.assertEqual(tbi, 'Adam & Eve')
+        self.assertFalse(formatting)
+        self.assertEqual(
+            repr(snapshot), '<TracebackSnapshot builtins.ValueError '
+            '(2 frames)>')
+
+    def test_keeps_no_references(self):
+        obj = Marker()
+        ref = weakref.ref(obj)
+        snapshot = self._capture(obj=obj)
+        del obj
+        self.assertIsNone(ref())
+        self.assertEqual(snapshot.frames[-1][5][0], '<Marker>')
+
+    def test_broken_supplement(self):
+        from zExceptions import ExceptionFormatter
+        debug = ExceptionFormatter.DEBUG_EXCEPTION_FORMATTER
+        ExceptionFormatter.DEBUG_EXCEPTION_FORMATTER = 0
+        try:
+            snapshot = self._capture(broken=True)
+        finally:
+            ExceptionFormatter.DEBUG_EXCEPTION_FORMATTER = debug
+        self.assertIsNone(snapshot.frames[-1][5])
+
+    def test_pickle(self):
+        snapshot = self._capture(obj=Marker())
+        data = pickle.dumps(snapshot)
+        self.assertNotIn(b'Marker\n', data.replace(b'<Marker>', b''))
+        copy = pickle.loads(data)
+        self.assertEqual(copy, snapshot)
+        self.assertEqual(hash(copy), hash(snapshot))
+
+    def test_format(self, as_html=0):
+        from zExceptions.ExceptionFormatter import format_exception
+        from zExceptions.ExceptionFormatter import format_snapshot
+        info = excInfoWithSupplement(obj=Marker())
+        snapshot = self._getTargetClass().capture(*info)
+        expected = format_exception(*info, as_html=as_html)
+        del info
+        self.assertEqual(format_snapshot(snapshot, as_html=as_html), expected)
+        self.assertEqual(
+            format_snapshot(pickle.loads(pickle.dumps(snapshot)),
+                            as_html=as_html),
+            expected)
+
+    def test_format_html(self):
+        self.test_format(as_html=1)
+
+    def test_format_limit(self):
+        from zExceptions.ExceptionFormatter import format_exception
+        from zExceptions.ExceptionFormatter import format_snapshot
+        info = excInfoWithSupplement()
+        snapshot = self._getTargetClass().capture(*info)
+        self.assertEqual(format_snapshot(snapshot, limit=1),
+                         format_exception(*info, limit=1))
@@ -0,0 +1,88 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Unit tests for template module.
+"""
+
+import unittest
+
+
+class CompiledTemplateTests(unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zExceptions.template import CompiledTemplate
+        return CompiledTemplate
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def test_matches_str_format(self):
+        from zExceptions import ERROR_HTML
+        template = self._makeOne(ERROR_HTML)
+        self.assertEqual(
+            template.render(title='Foo', detail='<p>Bar</p>'),
+            ERROR_HTML.format(title='Foo', detail='<p>Bar</p>'))
+
+    def test_literal_only(self):
+        template = self._makeOne('{{no fields}}')
+        self.assertEqual(template.render(title='Foo', detail='Bar'),
+                         '{no fields}')
+
+    def test_repeated_field(self):
+        template = self._makeOne('{title}-{title}')
+        self.assertEqual(template.render(title='Foo', detail=''), 'Foo-Foo')
+
+    def test_conversions_and_spec(self):
+        template = self._makeOne('{title!h}|{detail!r}|{title:>5}')
+        self.assertEqual(template.render(title='<a>', detail='b'),
+                         "&lt;a&gt;|'b'|  <a>")
+
+    def test_non_string_value(self):
+        template = self._makeOne('{detail}')
+        self.assertEqual(template.render(title='', detail=42), '42')
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            self._makeOne('{message}')
+        with self.assertRaises(ValueError):
+            self._makeOne('{}')
+        with self.assertRaises(ValueError):
+            self._makeOne('{title.upper}')
+
+    def test_custom_fields(self):
+        template = self._makeOne('{message}', fields=('message',))
+        self.assertEqual(template.render(message='Foo'), 'Foo')
+
+    def test_unknown_conversion(self):
+        with self.assertRaises(ValueError):
+            self._makeOne('{title!x}')
+
+    def test_nested_field(self):
+        with self.assertRaises(ValueError):
+            self._makeOne('{title:{detail}}')
+
+    def test_malformed(self):
+        with self.assertRaises(ValueError):
+            self._makeOne('{title')
+
+    def test_repr(self):
+        self.assertEqual(repr(self._makeOne('{title}')),
+                         "<CompiledTemplate '{title}'>")
+
+
+class CompileTemplateTests(unittest.TestCase):
+
+    def test_cached(self):
+        from zExceptions.template import compileTemplate
+        self.assertIs(compileTemplate('<b>{title}</b>'),
+                      compileTemplate('<b>{title}</b>'))
@@ -131,3 +131,141 @@ class UnauthorizedTests(unittest.TestCase):
             str(exc),
             "You are not allowed to access "
             "'ERROR_NAME_\u03A9' in this context")
+
+    def test_no_instance_dict(self):
+        exc = self._makeOne('ERROR_NAME', needed={'permission': 'View'})
+        self.assertEqual(vars(exc), {})
+        self.assertEqual(exc.realm, None)
+
+    def test_realm_after_reset(self):
+        exc = self._makeOne('ERROR_NAME', realm='Zope')
+        self.assertEqual(exc.realm, 'Zope')
+        exc.setRealm(None)
+        self.assertEqual(exc.realm, None)
+
+    def test_name_with_surrounding_whitespace(self):
+        exc = self._makeOne(' ERROR_NAME\n')
+        self.assertEqual(exc.name, ' ERROR_NAME\n')
+        self.assertEqual(exc.message, None)
+        exc = self._makeOne(b'\tERROR_NAME ')
+        self.assertEqual(exc.name, b'\tERROR_NAME ')
+
+    def test_message_with_unicode_whitespace(self):
+        exc = self._makeOne('ERROR\u2003MESSAGE')
+        self.assertEqual(exc.name, None)
+        self.assertEqual(exc.message, 'ERROR\u2003MESSAGE')
+
+    def test_realm_header_lazy(self):
+        exc = self._makeOne('ERROR_NAME', realm='Zope')
+        self.assertEqual(vars(exc), {})
+        self.assertEqual(exc.getHeader('WWW-Authenticate'),
+                         'basic realm="Zope"')
+        self.assertEqual(dict(exc.headers),
+                         {'WWW-Authenticate': 'basic realm="Zope"'})
+
+    def test_realm_header_in_response(self):
+        exc = self._makeOne('ERROR_NAME', realm='Zope')
+        headers = []
+        exc({}, lambda status, h: headers.extend(h))
+        self.assertIn(('WWW-Authenticate', 'basic realm="Zope"'), headers)
+
+    def test_realm_header_overridden(self):
+        exc = self._makeOne('ERROR_NAME', realm='Zope')
+        exc.setHeader('WWW-Authenticate', 'Bearer')
+        self.assertEqual(exc.getHeader('WWW-Authenticate'), 'Bearer')
+        exc.setRealm('Other')
+        self.assertEqual(exc.getHeader('WWW-Authenticate'),
+                         'basic realm="Other"')
+
+    def test_needed_with_keywords(self):
+        needed = {'permission': 'View'}
+        exc = self._makeOne('ERROR_NAME', needed=needed, role='Manager')
+        self.assertEqual(exc.needed,
+                         {'permission': 'View', 'role': 'Manager'})
+        # The mapping passed in is not changed.
+        self.assertEqual(needed, {'permission': 'View'})
+        exc = self._makeOne('ERROR_NAME', role='Manager')
+        self.assertEqual(exc.needed, {'role': 'Manager'})
+
+    def test_needed_set(self):
+        exc = self._makeOne('ERROR_NAME', role='Manager')
+        exc.needed = {'permission': 'View'}
+        self.assertEqual(exc.needed, {'permission': 'View'})
+
+    def test_str_cached(self):
+        exc = self._makeOne(b'ERROR_NAME')
+        self.assertIs(str(exc), str(exc))
+        self.assertIs(bytes(exc), bytes(exc))
+
+    def test_str_invalidated(self):
+        exc = self._makeOne('ERROR_NAME')
+        self.assertEqual(bytes(exc),
+                         b"You are not allowed to access 'ERROR_NAME' in "
+                         b"this context")
+        exc.name = 'OTHER_NAME'
+        self.assertEqual(
+            str(exc),
+            "You are not allowed to access 'OTHER_NAME' in this context")
+        self.assertEqual(bytes(exc),
+                         b"You are not allowed to access 'OTHER_NAME' in "
+                         b"this context")
+        exc.message = 'ERROR MESSAGE'
+        self.assertEqual(str(exc), 'ERROR MESSAGE')
+        self.assertEqual(bytes(exc), b'ERROR MESSAGE')
+        exc.message = exc.name = None
+        exc.value = 42
+        self.assertEqual(
+            str(exc),
+            "You are not allowed to access 'a particular int' in this context")
+
+    def test_getValueName(self):
+        def method():
+            pass
+        exc = self._makeOne(value=method)
+        self.assertEqual(exc.getValueName(), 'method')
+        self.assertEqual(
+            str(exc),
+            "You are not allowed to access 'method' in this context")
+        exc.value = object()
+        self.assertEqual(exc.getValueName(), 'a particular object')
+
+    def test_str_empty_not_cached(self):
+        exc = self._makeOne()
+        self.assertEqual(str(exc), 'Unauthorized()')
+        exc.args = ('changed',)
+        self.assertEqual(str(exc), "Unauthorized('changed')")
+        self.assertEqual(bytes(exc), b"Unauthorized('changed')")
+
+    def test_pickle(self):
+        import pickle
+        exc = self._makeOne('ERROR_NAME', value=42, needed={'p': 1})
+        copy = pickle.loads(pickle.dumps(exc))
+        self.assertEqual(copy.name, 'ERROR_NAME')
+        self.assertEqual(copy.value, 42)
+        self.assertEqual(copy.needed, {'p': 1})
+        self.assertEqual(str(copy), str(exc))
+
+    def test_pickle_realm_and_needed(self):
+        import pickle
+        needed = {'p': 1}
+        exc = self._makeOne('msg here', realm='Zope', needed=needed,
+                            role='Manager')
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copy = pickle.loads(pickle.dumps(exc, protocol))
+            self.assertEqual(copy.message, 'msg here')
+            self.assertEqual(copy.realm, 'Zope')
+            self.assertEqual(copy.needed, {'p': 1, 'role': 'Manager'})
+            self.assertEqual(copy.getHeader('WWW-Authenticate'),
+                             'basic realm="Zope"')
+        self.assertEqual(needed, {'p': 1})
+
+    def test_copy_realm(self):
+        import copy
+        exc = self._makeOne('msg here', realm='Zope', needed={'p': 1})
+        clone = copy.copy(exc)
+        self.assertEqual(clone.realm, 'Zope')
+        self.assertEqual(clone.needed, {'p': 1})
+        self.assertEqual(clone.getHeader('WWW-Authenticate'),
+                         'basic realm="Zope"')
+        # The header was not materialized on the original by copying.
+        self.assertEqual(exc._pending_realm, 'Zope')
@@ -11,24 +11,93 @@
 #
 ##############################################################################
 
-from zope.interface import implementer
-from zope.security.interfaces import IUnauthorized
-
 from zExceptions import HTTPClientError
+from zExceptions.lazyinterfaces import lazy_implementer
 
 
-@implementer(IUnauthorized)
+@lazy_implementer('zope.security.interfaces', 'IUnauthorized')
 class Unauthorized(HTTPClientError):
     """Some user wasn't allowed to access a resource
     """
+    # The WWW-Authenticate header and the merged `needed` mapping are only
+    # computed when used.  Most instances are raised and caught by
+    # security checks and never rendered.  The string and the value name
+    # are computed once, until name, message or value are changed.
+    __slots__ = ('_name', '_message', '_value', '_needed', '_extra',
+                 '_realm', '_pending_realm', '_headers', '_str', '_bytes',
+                 '_value_name')
+
     errmsg = 'Unauthorized'
-    realm = None
     status = 401
 
+    def _invalidate(self):
+        self._str = self._bytes = self._value_name = None
+
+    def _get_name(self):
+        return self._name
+
+    def _set_name(self, value):
+        self._name = value
+        self._invalidate()
+
+    name = property(_get_name, _set_name)
+
     def _get_message(self):
         return self._message
 
-    message = property(_get_message,)
+    def _set_message(self, value):
+        self._message = value
+        self._invalidate()
+
+    message = property(_get_message, _set_message)
+
+    def _get_value(self):
+        return self._value
+
+    def _set_value(self, value):
+        self._value = value
+        self._invalidate()
+
+    value = property(_get_value, _set_value)
+
+    def _get_realm(self):
+        return getattr(self, '_realm', None)
+
+    def _set_realm(self, value):
+        self._realm = value
+
+    realm = property(_get_realm, _set_realm)
+
+    def _get_needed(self):
+        extra = getattr(self, '_extra', None)
+        if extra:
+            # Never update the mapping passed by the caller.
+            needed = dict(self._needed) if self._needed else {}
+            needed.update(extra)
+            self._needed = needed
+            self._extra = None
+        return self._needed
+
+    def _set_needed(self, value):
+        self._needed = value
+        self._extra = None
+
+    needed = property(_get_needed, _set_needed)
+
+    def _get_headers(self):
+        realm = self._pending_realm
+        if realm is not None:
+            self._pending_realm = None
+            self.setHeader('WWW-Authenticate', 'basic realm="%s"' % realm)
+        return self._headers
+
+    def _set_headers(self, value):
+        self._headers = value
+
+    def _del_headers(self):
+        self._headers = None
+
+    headers = property(_get_headers, _set_headers, _del_headers)
 
     def __init__(self, message=None, value=None, needed=None,
                  name=None, realm=None, **kw):
@@ -48,54 +117,71 @@ class Unauthorized(HTTPClientError):
         """
         if (name is None and (
                 not isinstance(message, (str, bytes)) or
-                len(message.split()) <= 1)):
-            # First arg is a name, not a message
+                len(message.split(None, 1)) <= 1)):
+            # First arg is a name, not a message.  Splitting stops at the
+            # first whitespace between two words.
             name = message
             message = None
 
-        self.name = name
+        self._name = name
         self._message = message
-        self.value = value
-        self.setRealm(realm)
-
-        if kw:
-            if needed:
-                needed.update(kw)
-            else:
-                needed = kw
-
-        self.needed = needed
+        self._value = value
+        self._str = self._bytes = self._value_name = None
+        self._needed = needed
+        self._extra = kw or None
+        self._realm = self._pending_realm = self._headers = None
+        if realm is not None:
+            self.setRealm(realm)
 
     def __str__(self):
-        if self.message is not None:
-            message = (self.message if
-                       isinstance(self.message, str) else
-                       self.message.decode('utf-8'))
-            return message
-        if self.name is not None:
-            name = (self.name if
-                    isinstance(self.name, str) else
-                    self.name.decode('utf-8'))
-            return ("You are not allowed to access '%s' in this context"
-                    % name)
-        elif self.value is not None:
-            return ("You are not allowed to access '%s' in this context"
-                    % self.getValueName())
-        return repr(self)
+        result = self._str
+        if result is not None:
+            return result
+        if self._message is not None:
+            message = self._message
+            result = (message if
+                      isinstance(message, str) else
+                      message.decode('utf-8'))
+        elif self._name is not None:
+            name = (self._name if
+                    isinstance(self._name, str) else
+                    self._name.decode('utf-8'))
+            result = ("You are not allowed to access '%s' in this context"
+                      % name)
+        elif self._value is not None:
+            result = ("You are not allowed to access '%s' in this context"
+                      % self.getValueName())
+        else:
+            # Depends on the args, which are not tracked.
+            return repr(self)
+        self._str = result
+        return result
 
     def __bytes__(self):
-        return self.__str__().encode('utf-8')
+        result = self._bytes
+        if result is None:
+            result = self.__str__().encode('utf-8')
+            if self._str is not None:
+                self._bytes = result
+        return result
 
     def setRealm(self, value):
+        if value is None and self.realm is None:
+            # Nothing to change, do not allocate the instance dict.
+            return
         self.realm = value
         if value:
-            self.setHeader('WWW-Authenticate', 'basic realm="%s"' % value)
+            self._pending_realm = value
 
     def getValueName(self):
-        v = self.value
-        vname = getattr(v, '__name__', None)
-        if vname:
+        vname = self._value_name
+        if vname is not None:
             return vname
-        c = getattr(v, '__class__', type(v))
-        c = getattr(c, '__name__', 'object')
-        return "a particular %s" % c
+        v = self._value
+        vname = getattr(v, '__name__', None)
+        if not vname:
+            c = getattr(v, '__class__', type(v))
+            c = getattr(c, '__name__', 'object')
+            vname = "a particular %s" % c
+        self._value_name = vname
+        return vname